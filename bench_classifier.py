@@ -0,0 +1,85 @@
+"""
+Benchmark of the keyword automaton in IndustryClassifier against the
+original per-keyword substring loop, and of the memoized batch API.
+
+    python bench_classifier.py [number_of_texts]
+"""
+import sys
+import random
+import time
+
+from classifier import IndustryClassifier
+
+
+def legacy_confidence_scores(industry_keywords, text_to_analyze):
+    """The scoring loop IndustryClassifier used before the automaton"""
+    scores = {}
+    total_matches = 0
+    for industry, keywords in industry_keywords.items():
+        matches = sum(keyword in text_to_analyze for keyword in keywords)
+        if matches > 0:
+            scores[industry] = matches
+            total_matches += matches
+    if total_matches > 0:
+        for industry in scores:
+            scores[industry] = (scores[industry] / total_matches) * 100
+    return scores
+
+
+def legacy_classify(industry_keywords, text_to_analyze):
+    scores = legacy_confidence_scores(industry_keywords, text_to_analyze)
+    if not scores:
+        return "Unknown"
+    return max(scores, key=scores.get)
+
+
+def build_samples(industry_keywords, count, seed=42):
+    """Short Google Maps style categories and longer BL style descriptions"""
+    rng = random.Random(seed)
+    keywords = [keyword for group in industry_keywords.values() for keyword in group]
+    filler = ("the company based in douala offers quality services to clients across cameroon "
+              "since many years with a team of experienced staff and modern equipment").split()
+    categories = ["Restaurant", "Hotel", "Bank", "Pharmacy", "Hospital", "School", "Supermarket",
+                  "Car repair", "Church", "Bakery", "Software company", "Travel agency"]
+    samples = []
+    for i in range(count):
+        if i % 2:
+            samples.append(rng.choice(categories))
+        else:
+            words = [rng.choice(filler) for _ in range(rng.randint(20, 120))]
+            for _ in range(rng.randint(0, 4)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+            samples.append(" ".join(words))
+    return samples
+
+
+def timed(func, samples):
+    start = time.perf_counter()
+    results = [func(sample) for sample in samples]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    classifier = IndustryClassifier()
+    samples = build_samples(classifier.industry_keywords, count)
+
+    legacy_time, legacy_results = timed(lambda text: legacy_classify(classifier.industry_keywords, text), samples)
+    new_time, new_results = timed(classifier._classify_text, samples)
+
+    start = time.perf_counter()
+    batch_results = classifier.classify_many([(text, "desc") for text in samples])
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(legacy_results, new_results))
+    mismatches += sum(a != b for a, b in zip(legacy_results, batch_results))
+    print(f"texts: {count}, keywords: {len(classifier.matcher.keywords)}")
+    print(f"legacy loop : {legacy_time:.3f}s ({legacy_time / count * 1e6:.1f} us/text)")
+    print(f"automaton   : {new_time:.3f}s ({new_time / count * 1e6:.1f} us/text)")
+    print(f"speedup     : {legacy_time / new_time:.1f}x")
+    print(f"classify_many (memoized): {batch_time:.3f}s, cache {classifier.cache_stats()}")
+    print(f"mismatches  : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
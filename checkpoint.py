@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import logging
+import threading
+
+
+class CheckpointJournal:
+    def __init__(self, path: str = None, compact_every: int = 5000, fsync: bool = False):
+        """
+        Append-only journal of scraping progress.
+
+        Every finished city, listing page or company is one JSON line appended
+        to the journal, instead of rewriting a whole JSON file. The journal is
+        replayed into memory on start, so an interrupted run resumes where it
+        stopped. Compaction rewrites it without superseded lines and without
+        the page and company entries of cities that are already done.
+
+        Args:
+            path: Journal file, defaults to files/checkpoint.jsonl
+            compact_every: Number of appended lines between two compactions
+            fsync: fsync after every append, slower but survives power loss
+        """
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('CheckpointJournal')
+
+        self.path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "files", "checkpoint.jsonl")
+        self.compact_every = compact_every
+        self.fsync = fsync
+
+        # (flow, kind) -> {key: data}
+        self._state = {}
+        self._lock = threading.Lock()
+        self._appended = 0
+
+        lines = self._load()
+        if lines > 2 * self._live_entries() + self.compact_every:
+            self.compact()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and not self._ends_with_newline():
+            # terminate a line cut short by a crash so the next record starts clean
+            self._file.write("\n")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        lines = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a line cut short by a crash
+                    continue
+                lines += 1
+                self._apply(record)
+        self.logger.info(f"Loaded {lines} checkpoint records from {self.path}")
+        return lines
+
+    def _apply(self, record) -> None:
+        self._state.setdefault((record["flow"], record["kind"]), {})[record["key"]] = record.get("data", {})
+
+    def _live_entries(self) -> int:
+        return sum(len(entries) for entries in self._state.values())
+
+    def mark(self, flow: str, kind: str, key: str, **data) -> None:
+        """
+        Record `key` as done.
+
+        Args:
+            flow: Scraper the progress belongs to ("bl", "google", "searchcameroon")
+            kind: "city", "page" or "company"
+            key: City name, page URL or company URL/name
+            data: Extra values kept with the entry, e.g. the city of a page or the next page URL
+        """
+        record = {"flow": flow, "kind": kind, "key": key, "data": data, "at": round(time.time(), 3)}
+        with self._lock:
+            self._apply(record)
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._appended += 1
+            due = self._appended >= self.compact_every
+        if due:
+            self.compact()
+
+    def is_done(self, flow: str, kind: str, key: str) -> bool:
+        with self._lock:
+            return key in self._state.get((flow, kind), {})
+
+    def done(self, flow: str, kind: str) -> dict:
+        """Every finished key of a kind, with its data"""
+        with self._lock:
+            return dict(self._state.get((flow, kind), {}))
+
+    def seed(self, flow: str, kind: str, keys) -> int:
+        """Import progress from a legacy file once, when the journal has nothing for this flow"""
+        with self._lock:
+            if any(state_flow == flow for state_flow, _ in self._state):
+                return 0
+        count = 0
+        for key in keys:
+            self.mark(flow, kind, key, seeded=True)
+            count += 1
+        if count:
+            self.logger.info(f"Seeded {count} {kind} checkpoints for {flow}")
+        return count
+
+    def compact(self) -> None:
+        """Rewrite the journal with one line per live entry"""
+        with self._lock:
+            done_cities = {
+                flow: set(entries)
+                for (flow, kind), entries in self._state.items() if kind == "city"
+            }
+            for (flow, kind), entries in self._state.items():
+                if kind in ("page", "company"):
+                    for key in [key for key, data in entries.items() if data.get("city") in done_cities.get(flow, ())]:
+                        del entries[key]
+
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for (flow, kind), entries in self._state.items():
+                    for key, data in entries.items():
+                        f.write(json.dumps({"flow": flow, "kind": kind, "key": key, "data": data}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            file = getattr(self, "_file", None)
+            if file is not None:
+                file.close()
+            os.replace(temp_path, self.path)
+            if file is not None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._appended = 0
+        self.logger.info(f"Compacted checkpoint journal to {self._live_entries()} entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
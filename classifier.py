@@ -1,9 +1,65 @@
 import os
 import json
 import logging
+import threading
+from collections import OrderedDict
+
+from keyword_matcher import KeywordMatcher
+
+class ClassificationCache:
+    def __init__(self, maxsize=4096):
+        """
+        Bounded LRU memo of classification results with hit/miss counters.
+
+        Args:
+            maxsize: Maximum number of distinct inputs kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def record_hits(self, count):
+        """Count lookups answered without `get`, e.g. repeats inside one batch"""
+        with self._lock:
+            self.hits += count
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
 
 class IndustryClassifier:
-    def __init__(self):
+    def __init__(self, case_insensitive=False, word_boundary=False, cache_size=4096):
+        """
+        Args:
+            case_insensitive: Match keywords regardless of case
+            word_boundary: Only match keywords that are not part of a longer word
+            cache_size: Number of distinct inputs whose result is memoized
+        """
 
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.files_dir = os.path.join(self.current_dir, "files")
@@ -17,51 +73,48 @@ class IndustryClassifier:
         file_path = os.path.join(self.files_dir, "industry_mapper.json")
         with open(file_path) as f:
             self.industry_keywords = json.load(f)
+
+        # every keyword compiled once, a text is scored in a single pass
+        self.matcher = KeywordMatcher(
+            self.industry_keywords,
+            case_insensitive=case_insensitive,
+            word_boundary=word_boundary
+        )
+        
+        # memo of results keyed on the normalized text
+        self.cache = ClassificationCache(maxsize=cache_size)
         
         # Configure logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('IndustryClassifier')
     
+    def _text_to_analyze(self, map_data, checker="tags") -> str:
+        if checker == "tags":
+            return ' '.join(map(str, map_data))
+        elif checker == "desc":
+            return str(map_data)
+        raise ValueError(f"Unknown checker: {checker}")
     
     def _get_possible_industries(self, map_data, checker="tags") -> list:
         
-        if checker == "tags":
-            text_to_analyze = ' '.join(map(str, map_data))
-        elif checker == "desc":
-            text_to_analyze = str(map_data)
-
+        text_to_analyze = self._text_to_analyze(map_data, checker)
         
         # If no text to analyze, return empty list
         if not text_to_analyze:
             return []
         
         # Find matching industries
-        matched_industries = []
-        for industry, keywords in self.industry_keywords.items():
-            # Check if any keyword matches
-            if any(keyword in text_to_analyze for keyword in keywords):
-                matched_industries.append(industry)
-        
-        return matched_industries
+        return list(self.matcher.count(text_to_analyze))
 
     def _get_confidence_scores(self, map_data, checker="tags") -> dict:
         """
         Get confidence scores for each industry based on keyword matches.
         """
-        if checker == "tags":
-            text_to_analyze = ' '.join(map(str, map_data))
-        elif checker == "desc":
-            text_to_analyze = str(map_data)
-        
-        scores = {}
-        total_matches = 0
+        text_to_analyze = self._text_to_analyze(map_data, checker)
         
         # Count matches for each industry
-        for industry, keywords in self.industry_keywords.items():
-            matches = sum(keyword in text_to_analyze for keyword in keywords)
-            if matches > 0:
-                scores[industry] = matches
-                total_matches += matches
+        scores = self.matcher.count(text_to_analyze)
+        total_matches = sum(scores.values())
         
         # Convert to percentages
         if total_matches > 0:
@@ -70,11 +123,48 @@ class IndustryClassifier:
         
         return scores
     
+    def _classify_text(self, text_to_analyze) -> str:
+        scores = self._get_confidence_scores(text_to_analyze, "desc")
+        if not scores:
+            return "Unknown"
+        return max(scores, key=scores.get)
+
+    def _normalize(self, map_data, checker) -> str:
+        """Memo key: the text that is actually scored, case folded when matching ignores case"""
+        return self.matcher.normalize(self._text_to_analyze(map_data, checker))
+
+    def _classify_cached(self, key) -> str:
+        industry = self.cache.get(key)
+        if industry is None:
+            industry = self._classify_text(key)
+            self.cache.put(key, industry)
+        return industry
+
     def classify_company(self, map_data, checker="tags") -> list:
         try:
-            scores = self._get_confidence_scores(map_data, checker)
-            if not scores:
-                return "Unknown"
-            return max(scores, key=scores.get)
+            return self._classify_cached(self._normalize(map_data, checker))
         except Exception as e:
             self.logger.error(f"Something went wrong while classifying: {str(e)}")
+
+    def classify_many(self, items) -> list:
+        """
+        Classify a batch of companies, scoring each distinct input only once.
+
+        Args:
+            items: Iterable of (map_data, checker) pairs, as passed to `classify_company`
+
+        Returns:
+            Industry names in the order of `items`
+        """
+        try:
+            keys = [self._normalize(map_data, checker) for map_data, checker in items]
+            industries = {key: self._classify_cached(key) for key in dict.fromkeys(keys)}
+            # a repeat within the batch is served from the memo like any later lookup
+            self.cache.record_hits(len(keys) - len(industries))
+            return [industries[key] for key in keys]
+        except Exception as e:
+            self.logger.error(f"Something went wrong while classifying: {str(e)}")
+
+    def cache_stats(self) -> dict:
+        """Hit/miss statistics of the classification memo"""
+        return self.cache.stats()
@@ -1,8 +1,131 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
+import os
 import time
 import logging
+import threading
+
+from write_behind import append_spill, default_spill_path, run_callbacks
+
+class MongoClientRegistry:
+    def __init__(self,
+                max_pool_size: int = 50,
+                min_pool_size: int = 0,
+                write_concern: Optional[str] = None,
+                compressors: str = "zlib"):
+        """
+        Hands out one pooled MongoClient per connection string.
+
+        Every MongoDataHandler on the same cluster shares that client, so
+        there is a single connection pool, one set of monitoring threads and
+        one handshake. Clients are reference counted and closed when the last
+        handler releases them.
+
+        Args:
+            max_pool_size: Maximum connections in each client's pool
+            min_pool_size: Connections kept open even when idle
+            write_concern: Write concern `w` ("majority", "1", ...), server default when None
+            compressors: Comma separated wire compressors, e.g. "zstd,snappy,zlib"
+        """
+        self.options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+        }
+        if write_concern:
+            self.options["w"] = int(write_concern) if write_concern.isdigit() else write_concern
+        if compressors:
+            self.options["compressors"] = compressors
+
+        self._clients: Dict[str, MongoClient] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('MongoClientRegistry')
+
+    def acquire(self, connection_string: str) -> MongoClient:
+        """Return the shared client for `connection_string`, creating it on first use"""
+        with self._lock:
+            client = self._clients.get(connection_string)
+            if client is None:
+                client = MongoClient(connection_string, **self.options)
+                self._clients[connection_string] = client
+                self._refcounts[connection_string] = 0
+                self.logger.info(f"Opened shared MongoClient with options {self.options}")
+            self._refcounts[connection_string] += 1
+            return client
+
+    def release(self, connection_string: str) -> None:
+        """Drop one reference, the client is closed when nobody uses it anymore"""
+        with self._lock:
+            if connection_string not in self._refcounts:
+                return
+            self._refcounts[connection_string] -= 1
+            if self._refcounts[connection_string] <= 0:
+                self._clients.pop(connection_string).close()
+                del self._refcounts[connection_string]
+                self.logger.info("Closed shared MongoClient")
+
+    def close_all(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._refcounts.clear()
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_client_registry() -> MongoClientRegistry:
+    """
+    Return the process-wide client registry.
+    Tuned with MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_WRITE_CONCERN and MONGO_COMPRESSORS.
+    """
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = MongoClientRegistry(
+                max_pool_size=int(os.environ.get("MONGO_MAX_POOL_SIZE", 50)),
+                min_pool_size=int(os.environ.get("MONGO_MIN_POOL_SIZE", 0)),
+                write_concern=os.environ.get("MONGO_WRITE_CONCERN"),
+                compressors=os.environ.get("MONGO_COMPRESSORS", "zlib"),
+            )
+        return _shared_registry
+
+class Histogram:
+    def __init__(self, bounds):
+        """
+        Fixed bucket histogram.
+
+        Args:
+            bounds: Ascending upper bounds of the buckets, values above the last go to "inf"
+        """
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={bound}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0,
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
 
 class MongoDataHandler:
     def __init__(self, 
@@ -11,9 +134,15 @@ class MongoDataHandler:
                 collection_name: str,
                 buffer_size: int = 100,
                 max_wait_time: int = 60,
-                bulk_entry=False):
+                bulk_entry=False,
+                registry: MongoClientRegistry = None,
+                name_cache: bool = False,
+                bulk_write: bool = False,
+                known_names: bool = False,
+                background_flush: bool = False,
+                retry_interval: float = 30):
         """
-        Initialize the data inserter.
+        Initialize the data inserter, a per-collection view on a shared MongoClient.
         
         Args:
             connection_string: MongoDB connection string
@@ -21,6 +150,17 @@ class MongoDataHandler:
             collection_name: Name of the collection
             buffer_size: Number of documents to buffer before inserting
             max_wait_time: Maximum time (in seconds) to wait before forcing an insert
+            registry: Registry providing the shared client, defaults to the process-wide one
+            name_cache: Preload a name -> id map used by `check_and_create_document`,
+                for small lookup collections such as industries
+            bulk_write: Make `insert_document` queue documents with client side ObjectIds
+                into buffered, unordered `insert_many` batches
+            known_names: With `bulk_entry`, keep the set of names already stored (warmed
+                from the collection) so `add_document` drops known duplicates locally
+            background_flush: Run a thread that flushes the buffer once it is `max_wait_time`
+                old, even when no new documents arrive. Stopped by `close_connection`
+            retry_interval: Seconds before a batch that failed to insert is tried again.
+                A batch still failing on `close_connection` goes to the write-behind spill file
         """
 
         # Configure logging
@@ -28,31 +168,113 @@ class MongoDataHandler:
         self.logger = logging.getLogger('MongoDataHandler')
 
 
-        self.client = MongoClient(connection_string)
+        self.registry = registry or get_client_registry()
+        self.connection_string = connection_string
+        self.client = self.registry.acquire(connection_string)
+        self._released = False
         self.db = self.client[database_name]
         self.collection_name = collection_name
         self.buffer_size = buffer_size
         self.max_wait_time = max_wait_time
         self.bulk_entry = bulk_entry
+        self.bulk_write = bulk_write
+        # set by an attached WriteBehindQueue
+        self.write_behind = None
         
         # Create buffer for documents
         self.buffer: List[Dict[str, Any]] = []
         self.last_insert_time = time.time()
-
-        if self.bulk_entry:
-            self.collection.create_index("name", unique=True)
-        
-        # Ensure collection exists
-        if collection_name not in self.db.list_collection_names():
-            self.db.create_collection(collection_name)
+        self.retry_interval = retry_interval
+        self._retry_at = 0.0
+        # _id -> callable run once that document is confirmed written
+        self._on_stored = {}
+        self._buffer_lock = threading.Lock()
+        self.stats = {"inserted": 0, "duplicates": 0, "skipped": 0, "errors": 0}
+        self.flush_latency_ms = Histogram([10, 50, 100, 250, 500, 1000, 5000])
+        self.flush_batch_size = Histogram([1, 10, 50, 100, 500, 1000])
         
+        # The collection is created by MongoDB on the first write
         self.collection = self.db[collection_name]
         
         self.logger.info(f"Connected to DB: {self.db} and Collection: {self.collection_name} ")
+
+        # add_document relies on this index to reject duplicate names, other handlers build it on first use
+        self.unique_name = None
+        if self.bulk_entry:
+            self._ensure_unique_name()
+
+        self.known_names = None
+        if self.bulk_entry and known_names:
+            self.known_names = {
+                doc["name"] for doc in self.collection.find({}, {"name": 1, "_id": 0}) if "name" in doc
+            }
+            self.logger.info(f"Loaded {len(self.known_names)} known names from {self.collection_name}")
+
+        self.name_cache = name_cache
+        self._name_ids: Dict[str, str] = {}
+        self._name_lock = threading.Lock()
+        if self.name_cache:
+            self._warm_name_cache()
+
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        if background_flush:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name=f"flusher-{collection_name}",
+                daemon=True
+            )
+            self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_connection()
+        return False
+
+    def _flush_periodically(self) -> None:
+        # check a few times per max_wait_time so documents never wait much longer than it
+        interval = max(0.5, self.max_wait_time / 4)
+        while not self._stop_flusher.wait(interval):
+            with self._buffer_lock:
+                due = (self.buffer and time.time() >= self._retry_at and
+                       time.time() - self.last_insert_time >= self.max_wait_time)
+            if due:
+                self.flush_buffer()
+
+    def _ensure_unique_name(self) -> bool:
+        """Create the unique index on `name` once, returns whether it exists"""
+        if self.unique_name is not None:
+            return self.unique_name
+        try:
+            self.collection.create_index("name", unique=True)
+            self.unique_name = True
+        except OperationFailure as e:
+            # existing duplicates keep the index from building, writes still go through without it
+            self.logger.warning(f"Could not create unique index on name for {self.collection_name}: {str(e)}")
+            self.unique_name = False
+        return self.unique_name
+
+    def _warm_name_cache(self) -> None:
+        """Make `name` unique and load every existing name -> id pair"""
+        self._ensure_unique_name()
+
+        names = {
+            doc["name"]: str(doc["_id"])
+            for doc in self.collection.find({}, {"name": 1})
+            if "name" in doc
+        }
+        with self._name_lock:
+            self._name_ids.update(names)
+        self.logger.info(f"Loaded {len(names)} names from {self.collection_name}")
     
     def add_document(self, document: Dict[str, Any]) -> None:
         """
-        Add a document to the buffer if document with same name doesnt exist and insert if conditions are met.
+        Add a document to the buffer and insert if conditions are met.
+        Names already stored are rejected by the unique index when the buffer
+        is flushed, or skipped right away when `known_names` is enabled. Where
+        the index cannot be built, the name is looked up before buffering.
         
         Args:
             document: Dictionary containing the document data
@@ -61,59 +283,166 @@ class MongoDataHandler:
         if 'name' not in document:
             raise ValueError("Document must contain a 'name' field")
         
-        # Check if document with this name exists
-        existing = self.collection.find_one({"name": document['name']}, {"_id": 1})
-        print(F"EXE: {existing}")
-        
-        if existing:
-            print(f"Document with name '{document['name']}' already exists, skipping")
-            return False
-        
-        self.buffer.append(document)
+        if self.known_names is not None:
+            with self._buffer_lock:
+                # names are only added once their insert is confirmed, see flush_buffer
+                known = document['name'] in self.known_names
+                if known:
+                    self.stats["skipped"] += 1
+            if known:
+                print(f"Document with name '{document['name']}' already exists, skipping")
+                return False
+
+        if not self._ensure_unique_name():
+            # no index to reject duplicates at flush time
+            if self.collection.find_one({"name": document['name']}, {"_id": 1}):
+                self._count(skipped=1)
+                print(f"Document with name '{document['name']}' already exists, skipping")
+                return False
         
-        # Check if we should insert based on buffer size or time
-        if (len(self.buffer) >= self.buffer_size or 
-            time.time() - self.last_insert_time >= self.max_wait_time):
-            print("FLUSH: Flushing Buffer")
-            self.flush_buffer()
+        self._buffer_document(document)
         return True
+
+    def queue_document(self, document: Dict[str, Any], on_stored=None) -> str:
+        """
+        Buffer a document for the next unordered `insert_many` and return its ID right away.
+        The ObjectId is assigned client side, so other documents can reference it before the write.
+
+        Args:
+            document: Dictionary containing the document data
+            on_stored: Optional callable run (from the flushing thread) once the document is written
+        """
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        if on_stored is not None:
+            with self._buffer_lock:
+                self._on_stored[document["_id"]] = on_stored
+        self._buffer_document(document)
+        return str(document["_id"])
+
+    def _buffer_document(self, document: Dict[str, Any]) -> None:
+        with self._buffer_lock:
+            self.buffer.append(document)
+            # Check if we should insert based on buffer size or time
+            due = (time.time() >= self._retry_at and
+                   (len(self.buffer) >= self.buffer_size or
+                    time.time() - self.last_insert_time >= self.max_wait_time))
+        if due:
+            self.flush_buffer()
     
-    def flush_buffer(self) -> None:
-        """Force insert all documents currently in the buffer."""
-        if not self.buffer:
-            return
+    def flush_buffer(self) -> bool:
+        """
+        Force insert all documents currently in the buffer. A batch that cannot be
+        written (connection errors, timeouts) goes back to the front of the buffer
+        and is retried after `retry_interval`. Returns False in that case.
+        """
+        with self._buffer_lock:
+            if not self.buffer:
+                return True
+            batch, self.buffer = self.buffer, []
+            self.last_insert_time = time.time()
             
+        start = time.perf_counter()
+        stored = batch
         try:
             print("FLUSH: Flushing Buffer")
-            self.collection.insert_many(self.buffer, ordered=False)
-            print(f"Inserted {len(self.buffer)} documents")
+            self.collection.insert_many(batch, ordered=False)
+            self._count(inserted=len(batch))
+            print(f"Inserted {len(batch)} documents")
+        except BulkWriteError as e:
+            # ordered=False inserts everything it can, duplicate key errors (11000) are expected
+            write_errors = e.details.get("writeErrors", [])
+            duplicates = sum(1 for error in write_errors if error.get("code") == 11000)
+            errors = len(write_errors) - duplicates
+            self._count(inserted=e.details.get("nInserted", 0), duplicates=duplicates, errors=errors)
+            print(f"Inserted {e.details.get('nInserted', 0)} documents, {duplicates} duplicates skipped")
+            if errors:
+                self.logger.error(f"{errors} documents failed to insert: {write_errors[0].get('errmsg')}")
+            # duplicates are stored already, refused documents are not
+            refused = {error.get("index") for error in write_errors if error.get("code") != 11000}
+            stored = [document for index, document in enumerate(batch) if index not in refused]
         except Exception as e:
-            self.logger.error(f"Error inserting documents: {str(e)}")
-            # if isinstance(e, BulkWriteError):
-            #     # Handle duplicate key errors
-            #     successful_inserts = len(e.details['nInserted'])
-            #     print(f"Inserted {successful_inserts} documents, {len(self.buffer) - successful_inserts} duplicates skipped")
-            # else:
-            #     print(f"Error inserting documents: {str(e)}")
-        
+            # nothing is known to be written: keep the batch, the IDs handed out must stay valid
+            self.logger.error(f"Error inserting documents, retrying {len(batch)} in {self.retry_interval}s: {str(e)}")
+            with self._buffer_lock:
+                self.buffer[:0] = batch
+                self._retry_at = time.time() + self.retry_interval
+            return False
         finally:
-            self.buffer = []
-            self.last_insert_time = time.time()
+            with self._buffer_lock:
+                self.flush_latency_ms.observe(round((time.perf_counter() - start) * 1000, 2))
+                self.flush_batch_size.observe(len(batch))
+
+        with self._buffer_lock:
+            self._retry_at = 0.0
+            if self.known_names is not None:
+                self.known_names.update(document["name"] for document in stored if "name" in document)
+            # refused documents lose their callback, their progress must not be recorded
+            callbacks = [self._on_stored.pop(document.get("_id"), None) for document in batch]
+            callbacks = [callback for callback, document in zip(callbacks, batch)
+                         if callback is not None and document in stored]
+        run_callbacks(callbacks, self.logger)
+        return True
+
+    def _spill_buffer(self) -> None:
+        """Hand documents that could not be written to the write-behind spill file"""
+        with self._buffer_lock:
+            batch, self.buffer = self.buffer, []
+            # not written yet: progress stays unrecorded so the next run scrapes these again
+            for document in batch:
+                self._on_stored.pop(document.get("_id"), None)
+        if not batch:
+            return
+        spill_path = self.write_behind.spill_path if self.write_behind is not None else default_spill_path()
+        append_spill(spill_path, [(self.collection_name, document) for document in batch])
+        self._count(errors=len(batch))
+        self.logger.error(f"Spilled {len(batch)} unwritten documents of {self.collection_name} to {spill_path}, "
+                          f"a run with WRITE_BEHIND replays them")
+
+    def _count(self, **counts) -> None:
+        with self._buffer_lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def flush_stats(self) -> dict:
+        """Insert counters with flush latency (ms) and batch size histograms"""
+        with self._buffer_lock:
+            return {
+                **self.stats,
+                "flush_latency_ms": self.flush_latency_ms.snapshot(),
+                "flush_batch_size": self.flush_batch_size.snapshot(),
+            }
     
     def __del__(self):
         """Ensure remaining documents are inserted when object is destroyed."""
         self.flush_buffer()
-        self.client.close()
-        self.logger.info(f"Connection to database: {self.db} at collection: {self.collection_name} has been closed! ")
+        self.close_connection()
     
     def close_connection(self):
-        self.client.close()
+        """Insert what is left in the buffer and release this view's reference on the shared client"""
+        if self._released:
+            return
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+        if not self.flush_buffer():
+            self._spill_buffer()
+        self._released = True
+        self.registry.release(self.connection_string)
         self.logger.info(f"Connection to database: {self.db} at collection: {self.collection_name} has been closed! ")
 
-    def insert_document(self, document) -> Optional[str]:
+    def insert_document(self, document, on_stored=None) -> Optional[str]:
         """
             Insert a single document into MongoDB Atlas and return its ID.
+            In `bulk_write` mode, or with a write-behind queue attached, the document
+            is queued and its preassigned ID returned. `on_stored` runs once the
+            document is actually written (or durably spilled by the write-behind queue),
+            so progress is never recorded for a document still sitting in memory.
         """
+        if self.write_behind is not None:
+            return self.write_behind.submit(self.collection_name, document, on_stored=on_stored)
+        if self.bulk_write:
+            return self.queue_document(document, on_stored=on_stored)
         try:
             
             # Insert the document
@@ -122,6 +451,8 @@ class MongoDataHandler:
             # Get the inserted document's ID
             document_id = str(result.inserted_id)
             print(f"Document inserted successfully with ID: {document_id}")
+            if on_stored is not None:
+                run_callbacks([on_stored], self.logger)
             return document_id
             
         except Exception as e:
@@ -130,28 +461,39 @@ class MongoDataHandler:
             
 
     def check_and_create_document(self, name: str) -> Optional[str]:
+        """
+            Return the ID of the document with this name, creating it if needed.
+            With `name_cache` known names are answered from memory; misses go
+            through a single atomic upsert, so concurrent workers never create duplicates.
+        """
+        if self.name_cache:
+            with self._name_lock:
+                document_id = self._name_ids.get(name)
+            if document_id is not None:
+                return document_id
 
         try:
-            
-            # Check if document with this name exists
-            existing_doc = self.collection.find_one({"name": name})
-            
-            if existing_doc:
-                # Document exists, return its ID
-                return str(existing_doc['_id'])
-            else:
-                # Document doesn't exist, create new one
-                # Add name and timestamp to the document data
-                document_data = {
-                    "name": name,
-                    "created_at": datetime.now(timezone.utc)
-                }
-                
-                # Insert the document
-                result = self.collection.insert_one(document_data)
-                return str(result.inserted_id)
-                
+            try:
+                document = self._upsert_name(name)
+            except DuplicateKeyError:
+                # two upserts raced on the unique index, the other one created it
+                document = self._upsert_name(name)
+
+            document_id = str(document['_id'])
+            if self.name_cache:
+                with self._name_lock:
+                    self._name_ids[name] = document_id
+            return document_id
+
         except Exception as e:
             self.logger.error(f"Error in check_and_create_document: {str(e)}")
             return None
-            
+
+    def _upsert_name(self, name: str) -> Dict[str, Any]:
+        return self.collection.find_one_and_update(
+            {"name": name},
+            {"$setOnInsert": {"name": name, "created_at": datetime.now(timezone.utc)}},
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
@@ -0,0 +1,124 @@
+import time
+import queue
+import threading
+import logging
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+class ChromeDriverPool:
+    def __init__(self, driver_factory, size: int = 1, max_pages_per_driver: int = 50, clear_cookies: bool = True, on_reset=None):
+        """
+        Pool of warm Chrome instances leased to page fetches.
+
+        Drivers are started once up front and reused: between two leases the
+        driver gets a fresh tab and its cookies are cleared, and after
+        `max_pages_per_driver` pages it is quit and replaced to keep Chrome's
+        memory in check. A driver that fails to reset is replaced as well.
+
+        Args:
+            driver_factory: Callable returning a new webdriver, e.g. `setup_driver`
+            size: Number of drivers kept warm
+            max_pages_per_driver: Pages served by a driver before it is recycled
+            clear_cookies: Clear all cookies between leases
+            on_reset: Optional callable(driver) run on the fresh tab, for per-tab setup
+        """
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.clear_cookies = clear_cookies
+        self.on_reset = on_reset
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('ChromeDriverPool')
+
+        self.stats = {"leases": 0, "waits": 0, "wait_seconds": 0.0, "restarts": 0, "resets": 0}
+        self._stats_lock = threading.Lock()
+        self._idle = queue.Queue()
+        self._drivers = []
+        for _ in range(size):
+            self._idle.put(self._start())
+
+    def _count(self, key, value=1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def _start(self) -> dict:
+        driver = self.driver_factory()
+        self._drivers.append(driver)
+        return {"driver": driver, "pages": 0}
+
+    def _quit(self, slot) -> None:
+        try:
+            slot["driver"].quit()
+        except WebDriverException as e:
+            self.logger.warning(f"Error quitting driver: {str(e)}")
+        if slot["driver"] in self._drivers:
+            self._drivers.remove(slot["driver"])
+
+    def _restart(self, slot) -> dict:
+        self._quit(slot)
+        self._count("restarts")
+        return self._start()
+
+    def _reset(self, driver) -> None:
+        """Leave the driver with a single blank tab and no cookies"""
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+        if self.clear_cookies:
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except WebDriverException:
+                driver.delete_all_cookies()
+        if self.on_reset is not None:
+            self.on_reset(driver)
+        self._count("resets")
+
+    @contextmanager
+    def lease(self):
+        """
+        Borrow a driver for one page, waiting if all of them are busy.
+
+            with pool.lease() as driver:
+                driver.get(url)
+        """
+        try:
+            slot = self._idle.get_nowait()
+        except queue.Empty:
+            start = time.time()
+            slot = self._idle.get()
+            self._count("waits")
+            self._count("wait_seconds", time.time() - start)
+        self._count("leases")
+
+        try:
+            yield slot["driver"]
+        finally:
+            slot["pages"] += 1
+            try:
+                if slot["pages"] >= self.max_pages_per_driver:
+                    slot = self._restart(slot)
+                else:
+                    self._reset(slot["driver"])
+            except WebDriverException as e:
+                self.logger.warning(f"Driver reset failed, restarting it: {str(e)}")
+                slot = self._restart(slot)
+            finally:
+                self._idle.put(slot)
+
+    def close(self) -> None:
+        """Quit every driver"""
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for driver in list(self._drivers):
+            self._quit({"driver": driver})
+        self.logger.info(f"Driver pool closed, stats: {self.stats}")
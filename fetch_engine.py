@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import logging
+from urllib.parse import urlparse
+
+import aiohttp
+from rate_limiter import get_rate_limiter
+from http_client import DEFAULT_HEADERS, get_http_client
+
+
+class FetchResponse:
+    """
+    Minimal response object returned by the async engine.
+
+    Mirrors the parts of `requests.Response` the extractors rely on
+    (`content`, `text`, `status_code`, `headers`, `url`).
+    """
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def __repr__(self):
+        return f"<FetchResponse [{self.status_code}] {self.url}>"
+
+
+class AsyncFetchEngine:
+    def __init__(self, concurrency=8, timeout=30, client=None, rate_limiter=None, cache=None):
+        """
+        Asyncio fetch engine built on aiohttp.
+
+        The engine owns a private event loop running on a daemon thread so
+        the synchronous flows can call `get` / `fetch_many` directly while
+        several requests stay in flight underneath.
+
+        Args:
+            concurrency (int): Maximum number of requests in flight across all domains
+            timeout (int): Total timeout for a single request in seconds
+            client (HTTPClient): Client providing pool limits and user agents, defaults to the process-wide one
+            rate_limiter (DomainRateLimiter): Per-domain limiter, defaults to the process-wide one
+            cache (HTTPCache): Optional on-disk cache, pages are always fetched when None
+        """
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.cache = cache
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.client = client or get_http_client()
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('AsyncFetchEngine')
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="AsyncFetchEngine", daemon=True)
+        self._thread.start()
+
+        self._session = None
+        self._semaphore = None
+
+    def _get_domain(self, url):
+        """Extract domain from URL"""
+        return urlparse(url).netloc
+
+    def _run(self, coro):
+        """Run a coroutine on the engine loop and block for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _ensure_session(self):
+        if self._session is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=self.client.make_connector(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=DEFAULT_HEADERS,
+                trace_configs=[self.client.make_trace_config()],
+            )
+        return self._session
+
+    def _cached_response(self, entry):
+        """Build a `FetchResponse` from a cache entry"""
+        return FetchResponse(url=entry.url, status_code=200, headers=entry.headers(), content=entry.body)
+
+    async def aget(self, url, **kwargs):
+        """
+        Fetch a single URL. Raises on network errors and non 2xx statuses,
+        like `EntityScraper.get`.
+        """
+        # Serve fresh pages from disk, revalidate stale ones
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            return self._cached_response(entry)
+
+        session = await self._ensure_session()
+        await self.rate_limiter.acquire_async(self._get_domain(url))
+
+        headers = dict(kwargs.pop("headers", {}))
+        headers.setdefault('User-Agent', self.client.next_user_agent())
+        if entry:
+            headers.update(self.cache.conditional_headers(entry))
+
+        async with self._semaphore:
+            try:
+                async with session.get(url, headers=headers, **kwargs) as response:
+                    content = await response.read()
+                    if entry and response.status == 304:
+                        self.cache.refresh(entry)
+                        return self._cached_response(entry)
+                    response.raise_for_status()
+                    if self.cache:
+                        self.cache.store(url, content, response.headers)
+                    return FetchResponse(
+                        url=str(response.url),
+                        status_code=response.status,
+                        headers=dict(response.headers),
+                        content=content,
+                        encoding=response.get_encoding(),
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error(f"Error fetching {url}: {str(e)}")
+                raise
+
+    async def afetch_many(self, urls, **kwargs):
+        """
+        Fetch many URLs concurrently. Results keep the order of `urls`;
+        failed fetches are logged and returned as None.
+        """
+        results = await asyncio.gather(*(self.aget(url, **kwargs) for url in urls), return_exceptions=True)
+        return [None if isinstance(result, BaseException) else result for result in results]
+
+    def get(self, url, **kwargs):
+        """Blocking wrapper around `aget`, same contract as `EntityScraper.get`"""
+        return self._run(self.aget(url, **kwargs))
+
+    def fetch_many(self, urls, **kwargs):
+        """Blocking wrapper around `afetch_many`"""
+        return self._run(self.afetch_many(list(urls), **kwargs))
+
+    async def _aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def close(self):
+        """Close the HTTP session and stop the engine loop"""
+        if not self._loop.is_running():
+            return
+        self._run(self._aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self.logger.info("Async fetch engine has been closed!")
@@ -0,0 +1,152 @@
+import os
+import time
+import math
+import sqlite3
+import hashlib
+import threading
+import logging
+
+
+def url_key(url) -> int:
+    """Signed 64-bit digest of a URL, what the seen-set stores instead of the URL itself"""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Bit array answering "definitely not seen" / "maybe seen" for 64-bit keys.
+
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: False positive rate at `capacity` keys
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # double hashing: two independent values derived from the key give every probe
+        h1 = key & 0xFFFFFFFFFFFFFFFF
+        h2 = (h1 * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & 0xFFFFFFFFFFFFFFFF | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class URLFrontier:
+    def __init__(self, path: str = None, expected_urls: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Persistent crawl frontier: pending listing/company URLs plus a seen-set.
+
+        Pending URLs live in SQLite in the order they were discovered, so a
+        crashed crawl picks up the same queue. Fetched URLs are kept as 64-bit
+        digests only, fronted by an in-memory Bloom filter (about 1.8 MB per
+        million URLs at 0.1%), so most lookups never touch the disk and
+        the ones that do are confirmed against the digest table.
+
+        Args:
+            path: SQLite file, defaults to files/frontier.sqlite
+            expected_urls: Seen-set size the Bloom filter is tuned for
+            error_rate: Bloom filter false positive rate at `expected_urls`
+        """
+        if path is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            path = os.path.join(current_dir, "files", "frontier.sqlite")
+        self.path = path
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('URLFrontier')
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pending (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                city TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pending_kind_city ON pending (kind, city)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS failed (url TEXT PRIMARY KEY, reason TEXT, at REAL)")
+        self._conn.commit()
+
+        self.stats = {"seen_hits": 0, "bloom_false_positives": 0}
+        self.bloom = BloomFilter(expected_urls, error_rate)
+        count = 0
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            self.bloom.add(key)
+            count += 1
+        self.logger.info(f"Frontier loaded: {count} seen URLs, {self.pending_count()} pending")
+
+    def seen(self, url) -> bool:
+        """True if `url` was already fetched and processed"""
+        key = url_key(url)
+        if key not in self.bloom:
+            return False
+        with self._lock:
+            found = self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+            self.stats["seen_hits" if found else "bloom_false_positives"] += 1
+        return found
+
+    def push(self, urls, kind: str, city: str = None) -> int:
+        """Queue the URLs that are neither seen nor pending yet, returns how many were added"""
+        rows = [(url, kind, city) for url in urls if url and not self.seen(url)]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO pending (url, kind, city) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def pending(self, kind: str, city: str = None) -> list:
+        """Pending URLs of a kind (and city), oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM pending WHERE kind = ? AND city IS ? ORDER BY id",
+                (kind, city)
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    def mark_seen(self, url) -> None:
+        """Move `url` from the pending queue to the seen-set"""
+        key = url_key(url)
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+            self._conn.execute("DELETE FROM pending WHERE url = ?", (url,))
+            self._conn.commit()
+            self.bloom.add(key)
+
+    def mark_failed(self, url, reason: str) -> None:
+        """
+        Retire `url` like `mark_seen` and keep why it failed, so a page that cannot be
+        fetched or parsed is not retried on every run. Listed by `failed`.
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO failed (url, reason, at) VALUES (?, ?, ?)", (url, reason, time.time()))
+        self.mark_seen(url)
+
+    def failed(self) -> dict:
+        """{url: reason} of every URL retired by `mark_failed`"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT url, reason FROM failed ORDER BY at").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            failed = self._conn.execute("SELECT COUNT(*) FROM failed").fetchone()[0]
+            self._conn.close()
+        self.logger.info(f"Frontier closed, {failed} failed URLs, stats: {self.stats}")
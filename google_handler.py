@@ -2,6 +2,10 @@ import os
 import json
 import time
 import random
+import queue
+import base64
+import threading
+from collections import deque
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -10,13 +14,267 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from database import MongoDataHandler
+from rate_limiter import get_rate_limiter
+from driver_pool import ChromeDriverPool
+from tab_pool import TabPool, PageNotReady
+from maps_payload import (decode_place_payload, decode_search_payload, feature_id,
+                          PLACE_IN_INIT_STATE, SEARCH_IN_INIT_STATE)
 
 
 from bs4 import BeautifulSoup
 import re
 
+# Requests blocked in lean mode: we only read text from the feed and the info card
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*/maps/vt*", "*/maps/vt/pb*", "*khms*.google.com/kh/*", "*/kh/v=*",
+    "*googleusercontent.com/*", "*fonts.gstatic.com/*", "*fonts.googleapis.com/*",
+    "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*", "*/gen_204*",
+]
+
+# Network totals of every lean driver since the process started
+network_totals = {"pages": 0, "requests": 0, "bytes": 0, "blocked": 0}
+_network_lock = threading.Lock()
+
+
+def lean_mode_enabled():
+    return os.environ.get("GOOGLE_LEAN_BROWSER", "").lower() in ("1", "true", "yes")
+
+
+def apply_lean_profile(driver):
+    """Block the URL patterns above in the current tab, a new tab needs it again"""
+    if not getattr(driver, "lean", False):
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+
+
+# Messages a lean driver keeps for `network_stats`; the feed driver of capture mode drains
+# the log on every scroll but never reads its stats, so only the latest ones are kept
+NETWORK_BACKLOG_LIMIT = 5000
+
+
+def performance_messages(driver):
+    """Drain Chrome's performance log, lean drivers keep the messages for the next `network_stats`"""
+    messages = [json.loads(entry["message"])["message"] for entry in driver.get_log("performance")]
+    if getattr(driver, "lean", False):
+        if getattr(driver, "network_backlog", None) is None:
+            driver.network_backlog = deque(maxlen=NETWORK_BACKLOG_LIMIT)
+        driver.network_backlog.extend(messages)
+    return messages
+
+
+def network_stats(driver):
+    """
+    Requests, transferred bytes and blocked requests (by resource type) since the last call.
+    Reads the performance log, so it only works on lean drivers; returns None otherwise.
+    """
+    if not getattr(driver, "lean", False):
+        return None
+    performance_messages(driver)
+    messages, driver.network_backlog = driver.network_backlog, deque(maxlen=NETWORK_BACKLOG_LIMIT)
+    stats = {"requests": 0, "bytes": 0, "blocked": 0, "blocked_by_type": {}}
+    for message in messages:
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            stats["bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats["blocked"] += 1
+            resource_type = params.get("type", "Other")
+            stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+
+    with _network_lock:
+        network_totals["pages"] += 1
+        for key in ("requests", "bytes", "blocked"):
+            network_totals[key] += stats[key]
+    return stats
+
+
+# Places built from captured search payloads or the feed card alone vs. places that needed their detail page
+card_stats = {"from_search_payload": 0, "from_card": 0, "detail_pages": 0}
+_card_lock = threading.Lock()
+
+# Maps responses decoded in capture mode
+PLACE_RESPONSE_PATTERN = re.compile(r"/maps/preview/place")
+SEARCH_RESPONSE_PATTERN = re.compile(r"/search\?.*tbm=map|/maps/search/.*[?&]pb=")
+
+# Places decoded from search payloads, by feature id
+captured_places = {}
+_captured_lock = threading.Lock()
+
+
+def capture_mode_enabled():
+    return os.environ.get("GOOGLE_CAPTURE", "").lower() in ("1", "true", "yes")
+
+
+def response_bodies(driver, messages, pattern):
+    """Bodies of the responses in `messages` whose URL matches `pattern`"""
+    for message in messages:
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params", {})
+        if not pattern.search(params.get("response", {}).get("url", "")):
+            continue
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+        except Exception:
+            # evicted from Chrome's buffer or not finished loading
+            continue
+        if body.get("base64Encoded"):
+            yield base64.b64decode(body["body"]).decode("utf-8", errors="replace")
+        else:
+            yield body["body"]
+
+
+def _init_state_payload(driver, path):
+    script = "let data = window.APP_INITIALIZATION_STATE;" + "".join(
+        f" data = data == null ? null : data[{index}];" for index in path
+    ) + " return typeof data === 'string' ? data : null;"
+    return driver.execute_script(script)
+
+
+def capture_search_results(driver, city):
+    """Decode the search payloads loaded so far into `captured_places`, returns how many were added"""
+    payloads = list(response_bodies(driver, performance_messages(driver), SEARCH_RESPONSE_PATTERN))
+    if not getattr(driver, "initial_search_captured", False):
+        # the first page of results comes embedded in the search page itself
+        driver.initial_search_captured = True
+        initial = _init_state_payload(driver, SEARCH_IN_INIT_STATE)
+        if initial:
+            payloads.append(initial)
+
+    places = {}
+    for payload in payloads:
+        try:
+            places.update(decode_search_payload(payload, city))
+        except ValueError as e:
+            print(f"[ERROR] Undecodable search payload: {e}")
+    with _captured_lock:
+        before = len(captured_places)
+        captured_places.update(places)
+        return len(captured_places) - before
+
+
+def capture_place(company_driver, company_url, city, timeout=10):
+    """
+    Load a place page and decode its details payload instead of waiting on the DOM.
+    Returns the company_info, or None if no payload with a name showed up within `timeout`.
+    """
+    # responses of the previous lease must not be taken for this place
+    performance_messages(company_driver)
+    get_rate_limiter().acquire(company_url)
+    company_driver.get(company_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        payloads = list(response_bodies(company_driver, performance_messages(company_driver), PLACE_RESPONSE_PATTERN))
+        initial = _init_state_payload(company_driver, PLACE_IN_INIT_STATE)
+        if initial:
+            payloads.append(initial)
+        for payload in payloads:
+            try:
+                company_info = decode_place_payload(payload, city)
+            except ValueError:
+                continue
+            if company_info and company_info["name"]:
+                return company_info
+        time.sleep(0.2)
+    return None
+
+# phone-shaped text that is not a "4.2 (57)" rating
+PHONE_PATTERN = re.compile(r"^(?!\d[.,]\d\b)\+?[\d\s().-]{7,}$")
+
+
+def looks_like_phone(text):
+    return bool(PHONE_PATTERN.match(text)) and len(re.sub(r"\D", "", text)) >= 7
+
+
+def required_fields():
+    """company_info fields a feed card must provide to skip the detail page (GOOGLE_REQUIRED_FIELDS)"""
+    return [field.strip() for field in os.environ.get("GOOGLE_REQUIRED_FIELDS", "name,contact_numbers,website").split(",") if field.strip()]
+
+
+def missing_fields(company_info, fields):
+    return [field for field in fields if company_info.get(field) in (None, "", [], [None])]
+
+
+def parse_feed_card(card_html, company_url, city):
+    """
+    Build a company_info dict from one result card of the feed.
+
+    The card holds the name (link aria-label), a "category · address" line,
+    often the phone number and a website button; coordinates come from the
+    place URL. Fields the card does not show are None.
+
+    Args:
+        card_html: outerHTML of the element wrapping the place link
+        company_url: Google Maps place URL of the card
+        city: Capitalized city name, stripped from the address
+    """
+    card_soup = BeautifulSoup(card_html, 'lxml')
+    link = card_soup.find("a", href=lambda x: x and "/maps/place/" in x)
+    name = link.get("aria-label") if link else None
+
+    category, address, phone = None, None, None
+    phone_tag = card_soup.find("span", class_="UsdlK")
+    if phone_tag:
+        phone = phone_tag.get_text(strip=True)
+    # the rating ("4.2 (57)") must not be read as a phone number
+    for rating in card_soup.select('span[role="img"], .MW4etd, .UY7F9'):
+        rating.decompose()
+
+    # info lines are "·" separated: rating line, "category · address", "hours · phone"
+    for line in card_soup.find_all("div", class_="W4Efsd"):
+        if line.find("div", class_="W4Efsd"):
+            continue
+        parts = [part.strip() for part in line.get_text(" ", strip=True).split("·")]
+        parts = [part for part in parts if part]
+        if not parts:
+            continue
+        if phone is None and looks_like_phone(parts[-1]):
+            phone = parts[-1]
+        elif category is None and not parts[0][:1].isdigit() and not line.find("span", role="img"):
+            category = parts[0]
+            if len(parts) > 1 and not looks_like_phone(parts[-1]):
+                address = parts[-1].replace(f", {city}", "").strip()
+
+    website = card_soup.find("a", attrs={"data-value": "Website"}) or card_soup.find(
+        "a", attrs={"aria-label": lambda x: x and "website" in x.lower()}
+    )
+    website = website.get("href") if website else None
+
+    latitude, longitude = extract_coordinates(company_url)
+    return {
+        'name': name,
+        'address': address,
+        'contact_numbers': [phone],
+        'website': website,
+        'size': "",
+        'tags': "",
+        'description': category,
+        'latitude': latitude,
+        'longitude': longitude
+    }
+
+
 # Configure Selenium WebDriver (e.g., Chrome)
-def setup_driver():
+def setup_driver(lean=None, capture=None):
+    """
+    Start a headless Chrome.
+
+    Args:
+        lean: Block images, media, fonts, map tiles and trackers (see LEAN_BLOCKED_URLS)
+            and log network traffic for `network_stats`. Defaults to GOOGLE_LEAN_BROWSER
+        capture: Log network traffic so Maps payloads can be decoded (see maps_payload).
+            Defaults to GOOGLE_CAPTURE
+    """
+    if lean is None:
+        lean = lean_mode_enabled()
+    if capture is None:
+        capture = capture_mode_enabled()
 
     """
     options = webdriver.ChromeOptions()
@@ -65,6 +323,11 @@ def setup_driver():
     options.add_argument('--safebrowsing-disable-auto-update')
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.6998.88 Safari/537.36")
 
+    if lean:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if lean or capture:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     
     print("[INFO] Starting ChromeDriver...")
 
@@ -72,6 +335,9 @@ def setup_driver():
     service = Service(executable_path="/usr/bin/chromedriver", log_output="selenium.log")
     # service = Service(executable_path="C:/Users/User/Desktop/Ongoing Project/Instanvi/repo/ABM-scraper/chromedriver/chromedriver.exe")
     driver = webdriver.Chrome(service=service, options=options)
+    driver.lean = lean
+    driver.capture = capture
+    apply_lean_profile(driver)
     print("[INFO] ChromeDriver started successfully!")
     return driver
 
@@ -96,8 +362,66 @@ def extract_coordinates(url):
 
 # Scroll to the bottom of the page to load more results
 
+# Resolves as soon as the feed holds more cards than `previous`, the end of list
+# marker shows up, or `timeout` ms pass without either
+WAIT_FOR_FEED_GROWTH = """
+const [feed, previous, timeout] = arguments;
+const done = arguments[arguments.length - 1];
+const cards = () => feed.querySelectorAll('a[href*="/maps/place/"]').length;
+const atEnd = () => !!feed.querySelector('span.HlvSq')
+    || /reached the end of the list|fin de la liste/i.test(feed.innerText.slice(-300));
+let timer = null;
+const observer = new MutationObserver(() => check());
+const finish = (timedOut) => {
+    observer.disconnect();
+    clearTimeout(timer);
+    done({cards: cards(), end: atEnd(), timed_out: timedOut});
+};
+const check = () => {
+    if (cards() > previous || atEnd()) {
+        finish(false);
+        return true;
+    }
+    return false;
+};
+if (!check()) {
+    observer.observe(feed, {childList: true, subtree: true});
+    timer = setTimeout(() => finish(true), timeout);
+}
+"""
+
+# Place URL, aria-label and card HTML of every feed card from index arguments[1] on
+HARVEST_CARDS = """
+return Array.from(arguments[0].querySelectorAll('a[href*="/maps/place/"]'))
+    .slice(arguments[1])
+    .map(a => [a.href, a.getAttribute('aria-label'), a.parentElement.outerHTML]);
+"""
 
-def scroll_to_bottom(driver, city):
+# A place page opened in a tab can be read once its title is rendered
+PLACE_READY = """
+return document.querySelector('div[role="main"] h1') !== null;
+"""
+
+
+def scroll_to_bottom(driver, city, time_budget=None, idle_timeout=8, max_idle_rounds=2, on_cards=None):
+    """
+    Scroll the result feed until the end of the list, driven by DOM growth.
+
+    After each scroll a MutationObserver on the feed resolves as soon as new
+    cards are added, so the next scroll follows right away instead of after a
+    fixed sleep. Scrolling stops at the "end of the list" marker, after
+    `max_idle_rounds` scrolls that load nothing within `idle_timeout` seconds,
+    or when `time_budget` (GOOGLE_SCROLL_BUDGET, default 300s) is used up.
+    With `on_cards`, every batch of newly loaded cards is passed to it as
+    [(place_url, aria_label, card_html), ...] while the scrolling goes on.
+
+    Returns:
+        Scroll stats: cards, scrolls, seconds, waiting_seconds, cards_per_second, stopped_by
+    """
+    if time_budget is None:
+        time_budget = float(os.environ.get("GOOGLE_SCROLL_BUDGET", 300))
+    stats = {"cards": 0, "scrolls": 0, "seconds": 0.0, "waiting_seconds": 0.0, "cards_per_second": 0.0, "stopped_by": None}
+    start = time.time()
 
     try:
         print("[INFO] In scroll_to_bottom")
@@ -134,32 +458,319 @@ def scroll_to_bottom(driver, city):
         )))
         print(f"divSideBar gotten")
         
-        # Scroll multiple times
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        for i in range(100):
+        driver.set_script_timeout(idle_timeout + 5)
+        scroll_start = time.time()
+        cards = driver.execute_script("return arguments[0].querySelectorAll('a[href*=\"/maps/place/\"]').length;", divSideBar)
+        harvested = 0
+
+        def harvest():
+            nonlocal harvested
+            if on_cards is None or cards <= harvested:
+                return
+            new_cards = driver.execute_script(HARVEST_CARDS, divSideBar, harvested)
+            harvested += len(new_cards)
+            on_cards(new_cards)
+
+        harvest()
+        idle_rounds = 0
+        while True:
+            if time.time() - start >= time_budget:
+                stats["stopped_by"] = "time_budget"
+                break
 
             driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", divSideBar)
-            
-            # Random delay between 5 and 7 seconds
-            time.sleep(random.uniform(5, 7))
-            new_height = driver.execute_script("return arguments[0].scrollHeight;", divSideBar)
-            if last_height == new_height:
+            stats["scrolls"] += 1
+
+            wait_start = time.time()
+            state = driver.execute_async_script(WAIT_FOR_FEED_GROWTH, divSideBar, cards, int(idle_timeout * 1000))
+            stats["waiting_seconds"] += time.time() - wait_start
+            cards = state["cards"]
+            harvest()
+
+            if state["end"]:
+                stats["stopped_by"] = "end_of_list"
                 break
-            
-            last_height = new_height
+            idle_rounds = idle_rounds + 1 if state["timed_out"] else 0
+            if idle_rounds >= max_idle_rounds:
+                stats["stopped_by"] = "no_new_cards"
+                break
+
+            # short pause so the scrolling does not look scripted
+            time.sleep(random.uniform(0.3, 0.8))
+
+        stats["cards"] = cards
+        scroll_seconds = time.time() - scroll_start
+        stats["cards_per_second"] = round(cards / scroll_seconds, 2) if scroll_seconds else 0.0
     except Exception as e:
+        stats["stopped_by"] = "error"
         print(f"Scrolling failed: {e}")
         # Dump HTML for debugging
         with open("scroll_error.html", "w", encoding="utf-8") as f:
             f.write(driver.page_source)
 
+    stats["seconds"] = round(time.time() - start, 2)
+    stats["waiting_seconds"] = round(stats["waiting_seconds"], 2)
+    print(f"[INFO] Scroll stats for {city}: {stats}")
+    return stats
+
+
+
+def find_place_element(company_driver, xpath, wait):
+    """Element at `xpath`, waiting up to `wait` seconds; with `wait=0` raise PageNotReady at once if it is missing"""
+    if wait:
+        return WebDriverWait(company_driver, wait).until(EC.presence_of_element_located((By.XPATH, xpath)))
+    elements = company_driver.find_elements(By.XPATH, xpath)
+    if not elements:
+        raise PageNotReady(xpath)
+    return elements[0]
+
+
+def scrape_place(company_driver, company_url, city, navigate=True, wait=10):
+    """
+    Open one place page and read its info card.
+
+    Args:
+        company_driver: Driver leased for this page
+        company_url: Google Maps place URL
+        city: Capitalized city name, stripped from the address
+        navigate: Load `company_url` first, False when the page is already open
+        wait: Seconds to wait for the name and category, 0 to raise PageNotReady
+            instead (in a TabPool tab, where waiting would stall the other tabs)
+    """
+    if navigate:
+        get_rate_limiter().acquire(company_url)
+        company_driver.get(company_url)
+
+    # name_element = WebDriverWait(company_driver, 10).until(
+    #     EC.presence_of_element_located((By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[2]/div/div[1]/div[1]/h1'))
+    # )
+    name_element = find_place_element(company_driver, '//div[contains(@role, "main")]/div[2]/div/div[1]/div[1]/h1', wait)
+    name = name_element.text if name_element else None
+
+    # category_element = WebDriverWait(company_driver, 10).until(
+    #     EC.presence_of_element_located((By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[2]/div/div[1]/div[2]/div/div[2]/span/span/button'))
+    # )
+    category_element = find_place_element(company_driver, '//div[contains(@role, "main")]/div[2]/div/div[1]/div[2]/div/div[2]/span/span/button', wait)
+    category = category_element.text if category_element else None
+
+    # info_card = company_driver.find_element(By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[7]')
+    info_card = find_place_element(company_driver, '//div[contains(@role, "main")]/div[7]', 0)
+    info_card_soup = BeautifulSoup(info_card.get_attribute('outerHTML'), 'lxml')
+    page_network = network_stats(company_driver)
+    if page_network:
+        print(f"[INFO] Network for {company_url}: {page_network}")
+    # print(f"\ninfo_card_soup: {info_card_soup}\n")
+
+
+    try:
+        #try with soup
+        address = info_card_soup.find(
+            "button", 
+            attrs={"aria-label": lambda x: x and "Address:" in x}
+        )
+
+        if address:
+            address = address.get("aria-label")
+            address = address.replace("Address: ", "").replace(f", {city}", "").strip()
+        else:
+            address = info_card_soup.find(
+                "button", 
+                attrs={"aria-label": lambda x: x and "Adresse:" in x}
+            )
+            if address:
+                address = address.get("aria-label")
+                address = address.replace("Adresse: ", "").replace(f", {city}", "").strip()
+            else:
+                address = None
+    except:
+        address = None
+
+    try:
+        website = info_card_soup.find(
+            "a", 
+            attrs={"aria-label": lambda x: x and "Website:" in x}
+        )
+        if website:
+            website = website.get("href")
+        else:
+            website = info_card_soup.find(
+                "a", 
+                attrs={"aria-label": lambda x: x and "Site Web:" in x}
+            )
+            if website:
+                website = website.get("href")
+            else:
+                website =None
+    except:
+        website = None
+
+    try:
+        phone = info_card_soup.find(
+            "button", 
+            attrs={"aria-label": lambda x: x and "Phone:" in x}
+        )
+
+        if phone:
+            phone = phone.get("aria-label")
+            phone = phone.replace("Phone: ", "").strip()
+        else:
+            phone = info_card_soup.find(
+                "button", 
+                attrs={"aria-label": lambda x: x and "Numéro de téléphone:" in x}
+            )
+            if phone:
+                phone = phone.get("aria-label")
+                phone = phone.replace("Numéro de téléphone: ", "").strip()
+            else:
+                phone = None
+
+    except:
+        phone =  None
+
+    latitude, longitude = extract_coordinates(company_url)
+
+    company_info=  {
+        'name': name,
+        'address': address,
+        'contact_numbers': [phone],
+        'website': website,
+        'size': "",
+        'tags': "",
+        'description': category,
+        'latitude': latitude,
+        'longitude': longitude
+    }
+    return company_info
+
+
+def known_place_info(company_url, city, card_html=None):
+    """
+    company_info available without opening the place page, from a captured search
+    payload or (with GOOGLE_CARD_FAST_PATH) the feed card. Returns
+    (company_info, missing required fields, source), company_info is None if neither applies.
+    """
+    with _captured_lock:
+        captured = captured_places.get(feature_id(company_url))
+    if captured and not missing_fields(captured, required_fields()):
+        company_info = dict(captured)
+        # coordinates of the place URL, like every other path
+        company_info['latitude'], company_info['longitude'] = extract_coordinates(company_url)
+        return company_info, [], "from_search_payload"
+    if card_html and os.environ.get("GOOGLE_CARD_FAST_PATH", "").lower() in ("1", "true", "yes"):
+        company_info = parse_feed_card(card_html, company_url, city.capitalize())
+        return company_info, missing_fields(company_info, required_fields()), "from_card"
+    return None, None, None
+
+
+def read_open_place(company_driver, company_url, city, wait=10):
+    """company_info of the place page already loaded in `company_driver`, `wait` as in `scrape_place`"""
+    if getattr(company_driver, "capture", False):
+        payload = _init_state_payload(company_driver, PLACE_IN_INIT_STATE)
+        try:
+            company_info = decode_place_payload(payload, city) if payload else None
+        except ValueError:
+            company_info = None
+        if company_info and company_info["name"]:
+            return company_info
+    return scrape_place(company_driver, company_url, city, navigate=False, wait=wait)
+
+
+def store_place(company_url, company_info, source, detail_info, company_conn_str, city, handler, states, checkpoint):
+    """
+    Organise and store one place, `detail_info` (None if the detail page was not needed)
+    fills the fields `company_info` lacks. Returns the company id.
+    """
+    if detail_info is not None:
+        if company_info is not None:
+            # the detail page fills what the card did not show
+            for field in missing_fields(company_info, company_info.keys()):
+                company_info[field] = detail_info[field]
+        else:
+            company_info = detail_info
+        with _card_lock:
+            card_stats["detail_pages"] += 1
+    else:
+        with _card_lock:
+            card_stats[source] += 1
+    updated_company_data= handler._organise_company_data(company_info, city.capitalize(), states)
+    # the checkpoint is written once the buffered company actually reaches the database
+    company_id = insert_company(
+        company_conn_str, updated_company_data,
+        on_stored=lambda: checkpoint.mark("google", "company", company_url, city=city)
+    )
+    # companies.append(company_info)#here
+    
+    print(f"[INFO] Company Saved - Name: {updated_company_data['name']}, Id: {company_id}")
+    print(f"\n PRINTED company_info \n")
+    return company_id
+
+
+def process_place(company_url, company_conn_str, city, handler, states, checkpoint, driver_pool, card_html=None):
+    """
+    Scrape, organise and store one place unless an earlier run already did. Returns the company id.
+    With the card fast path (GOOGLE_CARD_FAST_PATH) and the card's `card_html`, the detail
+    page is only opened when the card misses one of the required fields.
+    """
+    if checkpoint.is_done("google", "company", company_url):
+        print(f"[INFO] Already scraped: {company_url}")
+        return None
+
+    company_info, missing, source = known_place_info(company_url, city, card_html)
+    detail_info = None
+    if company_info is None or missing:
+        print(f"GETTING: {company_url}")
+        # warm driver from the pool instead of a new Chrome per company
+        with driver_pool.lease() as company_driver:
+            if getattr(company_driver, "capture", False):
+                detail_info = capture_place(company_driver, company_url, city.capitalize())
+            if detail_info is None:
+                detail_info = scrape_place(company_driver, company_url, city.capitalize(),
+                                           navigate=not getattr(company_driver, "capture", False))
+    return store_place(company_url, company_info, source, detail_info, company_conn_str, city, handler, states, checkpoint)
+
+
+def process_places_in_tabs(places, company_conn_str, city, handler, states, checkpoint, tab_pool):
+    """
+    Store the places of a queue of (company_url, card_html), ended by None, loading
+    the detail pages that are needed in the tabs of `tab_pool` at the same time.
+    """
+    def next_job(wait):
+        while True:
+            try:
+                place = places.get(timeout=wait) if wait else places.get_nowait()
+            except queue.Empty:
+                return None
+            if place is None:
+                return TabPool.DONE
+            company_url, card_html = place
+            try:
+                if checkpoint.is_done("google", "company", company_url):
+                    print(f"[INFO] Already scraped: {company_url}")
+                    continue
+                company_info, missing, source = known_place_info(company_url, city, card_html)
+                if company_info is not None and not missing:
+                    store_place(company_url, company_info, source, None, company_conn_str, city, handler, states, checkpoint)
+                    continue
+            except Exception as e:
+                print(f"[ERROR] In getting company from card: \n{e}")
+                continue
+            print(f"GETTING: {company_url}")
+            return company_url, (company_info, source)
+
+    def on_ready(company_driver, company_url, context):
+        company_info, source = context
+        # a page still rendering goes back to the pool instead of blocking every tab
+        detail_info = read_open_place(company_driver, company_url, city.capitalize(), wait=0)
+        store_place(company_url, company_info, source, detail_info, company_conn_str, city, handler, states, checkpoint)
+
+    # the tab waits out the rate limit while the other tabs keep being polled
+    tab_pool.run(next_job, on_ready, ready_script=PLACE_READY, reserve=get_rate_limiter().reserve)
 
 
 # Scrape company information from the page
-def scrape_company_info(company_conn_str, driver, city, handler, states, file_path, scrapped_cities):
+def scrape_company_info(company_conn_str, driver, city, handler, states, checkpoint, driver_pool, tab_pool=None):
 
     companies = []
-    city = city.capitalize()
     try:
         # company_parent = driver.find_element(By.XPATH,  '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[1]')
         # company_parent_child = driver.find_element(By.XPATH, f'//div[contains(@aria-label, "Results for companies in {city}")]')
@@ -173,127 +784,25 @@ def scrape_company_info(company_conn_str, driver, city, handler, states, file_pa
         company_parent_soup = BeautifulSoup(company_parent.get_attribute('outerHTML'), 'lxml')
 
         company_cards = company_parent_soup.find_all("a", {"aria-label": True})
-        
+
+        if tab_pool is not None:
+            # detail pages load side by side in the tabs of one browser
+            places = queue.Queue()
+            for company in company_cards:
+                company_url = company.get("href")
+                if company_url and "https://www.google.com/maps/place/" in company_url:
+                    places.put((company_url, str(company.parent)))
+            places.put(None)
+            process_places_in_tabs(places, company_conn_str, city, handler, states, checkpoint, tab_pool)
+            return True
+
         for company in company_cards:
             try:
                 #open company card
                 company_url = company.get("href")
                 
                 if "https://www.google.com/maps/place/" in company_url:
-                    print(f"GETTING: {company_url}")
-                    company_driver = setup_driver()
-                    company_driver.get(company_url)
-
-                    # name_element = WebDriverWait(company_driver, 10).until(
-                    #     EC.presence_of_element_located((By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[2]/div/div[1]/div[1]/h1'))
-                    # )
-                    name_element = WebDriverWait(company_driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, f'//div[contains(@role, "main")]/div[2]/div/div[1]/div[1]/h1'))
-                    )
-                    name = name_element.text if name_element else None
-                    
-                    # category_element = WebDriverWait(company_driver, 10).until(
-                    #     EC.presence_of_element_located((By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[2]/div/div[1]/div[2]/div/div[2]/span/span/button'))
-                    # )
-                    category_element = WebDriverWait(company_driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, f'//div[contains(@role, "main")]/div[2]/div/div[1]/div[2]/div/div[2]/span/span/button'))
-                    )
-                    category = category_element.text if category_element else None
-
-                    # info_card = company_driver.find_element(By.XPATH, '//*[@id="QA0Szd"]/div/div/div[1]/div[2]/div/div[1]/div/div/div[7]')
-                    info_card = company_driver.find_element(By.XPATH, '//div[contains(@role, "main")]/div[7]')
-                    info_card_soup = BeautifulSoup(info_card.get_attribute('outerHTML'), 'lxml')
-                    # print(f"\ninfo_card_soup: {info_card_soup}\n")
-                    
-
-                    try:
-                        #try with soup
-                        address = info_card_soup.find(
-                            "button", 
-                            attrs={"aria-label": lambda x: x and "Address:" in x}
-                        )
-
-                        if address:
-                            address = address.get("aria-label")
-                            address = address.replace("Address: ", "").replace(f", {city}", "").strip()
-                        else:
-                            address = info_card_soup.find(
-                                "button", 
-                                attrs={"aria-label": lambda x: x and "Adresse:" in x}
-                            )
-                            if address:
-                                address = address.get("aria-label")
-                                address = address.replace("Adresse: ", "").replace(f", {city}", "").strip()
-                            else:
-                                address = None
-                    except:
-                        address = None
-                    
-                    try:
-                        website = info_card_soup.find(
-                            "a", 
-                            attrs={"aria-label": lambda x: x and "Website:" in x}
-                        )
-                        if website:
-                            website = website.get("href")
-                        else:
-                            website = info_card_soup.find(
-                                "a", 
-                                attrs={"aria-label": lambda x: x and "Site Web:" in x}
-                            )
-                            if website:
-                                website = website.get("href")
-                            else:
-                                website =None
-                    except:
-                        website = None
-
-                    try:
-                        phone = info_card_soup.find(
-                            "button", 
-                            attrs={"aria-label": lambda x: x and "Phone:" in x}
-                        )
-                        
-                        if phone:
-                            phone = phone.get("aria-label")
-                            phone = phone.replace("Phone: ", "").strip()
-                        else:
-                            phone = info_card_soup.find(
-                                "button", 
-                                attrs={"aria-label": lambda x: x and "Numéro de téléphone:" in x}
-                            )
-                            if phone:
-                                phone = phone.get("aria-label")
-                                phone = phone.replace("Numéro de téléphone: ", "").strip()
-                            else:
-                                phone = None
-                        
-                    except:
-                        phone =  None
-
-                    latitude, longitude = extract_coordinates(company_url)
-
-                    company_info=  {
-                        'name': name,
-                        'address': address,
-                        'contact_numbers': [phone],
-                        'website': website,
-                        'size': "",
-                        'tags': "",
-                        'description': category,
-                        'latitude': latitude,
-                        'longitude': longitude
-                    }
-                    company_driver.quit()
-                    updated_company_data= handler._organise_company_data(company_info, city, states)
-                    company_id = insert_company(company_conn_str, updated_company_data)
-                    with open(file_path, 'w') as f:
-                        json.dump(scrapped_cities, f, indent=4)
-                    # companies.append(company_info)#here
-                    
-                    time.sleep(random.uniform(3, 5))
-                    print(f"[INFO] Company Saved - Name: {updated_company_data['name']}, Id: {company_id}")
-                    print(f"\n PRINTED company_info \n")
+                    process_place(company_url, company_conn_str, city, handler, states, checkpoint, driver_pool, card_html=str(company.parent))
                     # break
             except Exception as e:
                 print(f"[ERROR] In getting company from card: \n{e}")
@@ -322,34 +831,111 @@ def set_company_connection(state="close", company_conn_str=None):
         return False
 """
 
-def insert_company(company_conn_str, company_data):
+def insert_company(company_conn_str, company_data, on_stored=None):
 
-    company_id = company_conn_str.insert_document(company_data)
+    company_id = company_conn_str.insert_document(company_data, on_stored=on_stored)
     print(f"Saved\n {company_data}\n")
     return company_id
 
+def stream_company_info(company_conn_str, driver, city, handler, states, checkpoint, driver_pool, tab_pool=None):
+    """
+    Scroll the feed and scrape places at the same time.
+
+    Cards are harvested batch by batch while `scroll_to_bottom` runs and
+    their place URLs queued for one detail worker per pooled driver, so
+    detail pages load while the feed is still growing. With `tab_pool`, a
+    single worker loads them in the pool's tabs instead.
+    """
+    places = queue.Queue()
+    queued = set()
+
+    def on_cards(cards):
+        if getattr(driver, "capture", False):
+            # decode the results before their cards reach the workers
+            capture_search_results(driver, city.capitalize())
+        for company_url, _, card_html in cards:
+            if company_url and "https://www.google.com/maps/place/" in company_url and company_url not in queued:
+                queued.add(company_url)
+                places.put((company_url, card_html))
+
+    def detail_worker():
+        while True:
+            place = places.get()
+            if place is None:
+                return
+            company_url, card_html = place
+            try:
+                process_place(company_url, company_conn_str, city, handler, states, checkpoint, driver_pool, card_html=card_html)
+            except Exception as e:
+                print(f"[ERROR] In getting company from card: \n{e}")
+
+    if tab_pool is not None:
+        workers = [threading.Thread(
+            target=process_places_in_tabs, name="place-tabs", daemon=True,
+            args=(places, company_conn_str, city, handler, states, checkpoint, tab_pool)
+        )]
+    else:
+        workers = [
+            threading.Thread(target=detail_worker, name=f"place-{i}", daemon=True)
+            for i in range(driver_pool.size)
+        ]
+    for worker in workers:
+        worker.start()
+
+    scroll_stats = scroll_to_bottom(driver, city, on_cards=on_cards)
+    print(f"[INFO] Harvested {len(queued)} places while scrolling")
+
+    for _ in workers:
+        places.put(None)
+    for worker in workers:
+        worker.join()
+    return scroll_stats["stopped_by"] != "error"
+
 # Main function
-def initiator(search_query, city, handler, states, file_path, scrapped_cities, company_conn_str):
+def initiator(search_query, city, handler, states, checkpoint, company_conn_str, driver_pool=None, streaming=None, tab_pool=None):
     # search_query = "companies in yaounde"
     url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
 
     driver = setup_driver()
     print("Gotten Initiator driver")
+    get_rate_limiter().acquire(url)
     driver.get(url)
     print("[INFO] URL gotten")
     # Wait for the page to load
     time.sleep(5)
 
-    # Scroll to load all results
-    print("[INFO] Starting Scroll to Button Func...")
-    scroll_to_bottom(driver, city)
+    # a caller running several cities passes its own pool so drivers stay warm between them
+    own_pool = driver_pool is None and tab_pool is None
+    if own_pool:
+        driver_pool = ChromeDriverPool(setup_driver, on_reset=apply_lean_profile)
 
-    # Scrape company information
-    print("[INFO] Starting Company Scraper...")
-    # companies = scrape_company_info(driver, city, handler, states, file_path, scrapped_cities)   
+    if streaming is None:
+        streaming = os.environ.get("GOOGLE_STREAMING", "").lower() in ("1", "true", "yes")
 
-    # company_conn_str = set_company_connection("open") 
-    result_status = scrape_company_info(company_conn_str, driver, city, handler, states, file_path, scrapped_cities)    
+    if streaming:
+        # detail pages are scraped while the feed is still scrolling
+        print("[INFO] Starting streaming Scroll and Company Scraper...")
+        result_status = stream_company_info(company_conn_str, driver, city, handler, states, checkpoint, driver_pool, tab_pool)
+    else:
+        # Scroll to load all results
+        print("[INFO] Starting Scroll to Button Func...")
+        scroll_to_bottom(driver, city)
+        if getattr(driver, "capture", False):
+            captured = capture_search_results(driver, city.capitalize())
+            print(f"[INFO] Decoded {captured} places from search payloads")
+
+        # Scrape company information
+        print("[INFO] Starting Company Scraper...")
+        # companies = scrape_company_info(driver, city, handler, states, checkpoint)   
+
+        # company_conn_str = set_company_connection("open") 
+        result_status = scrape_company_info(company_conn_str, driver, city, handler, states, checkpoint, driver_pool, tab_pool)
+
+    page_network = network_stats(driver)
+    if page_network:
+        print(f"[INFO] Network for search page: {page_network}")
+    if own_pool:
+        driver_pool.close()
     # closed = set_company_connection("close", company_conn_str) 
     
     # Close the driver
@@ -0,0 +1,208 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Optional
+
+
+class CacheEntry:
+    def __init__(self, url, body, etag, last_modified, content_type, fetched_at):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self.fetched_at = fetched_at
+
+    def headers(self) -> dict:
+        """Response headers reconstructed from the stored validators"""
+        headers = {}
+        if self.content_type:
+            headers["Content-Type"] = self.content_type
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    def __init__(self,
+                cache_dir: str = None,
+                max_bytes: int = 500 * 1024 * 1024,
+                default_ttl: int = 24 * 60 * 60,
+                ttl_rules: list = None):
+        """
+        Content-addressed on-disk HTTP cache with conditional revalidation.
+
+        Bodies are stored once per SHA-256 digest under `objects/`, a small
+        SQLite index maps URLs to bodies and their ETag / Last-Modified
+        validators. Entries younger than their TTL are served without
+        touching the network, older ones are revalidated with
+        If-None-Match / If-Modified-Since. The least recently used entries
+        are evicted once the stored bodies exceed `max_bytes`.
+
+        Args:
+            cache_dir: Cache folder, defaults to files/http_cache
+            max_bytes: Maximum total size of stored bodies
+            default_ttl: Seconds an entry is served without revalidation
+            ttl_rules: Optional [(url_regex, ttl_seconds)], first match wins
+        """
+        if cache_dir is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            cache_dir = os.path.join(current_dir, "files", "http_cache")
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or [])]
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('HTTPCache')
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._conn.commit()
+
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._total = self._total_bytes()
+
+    def _object_path(self, body_hash):
+        return os.path.join(self.objects_dir, body_hash[:2], body_hash)
+
+    def ttl_for(self, url) -> int:
+        """TTL of the first matching rule, else the default TTL"""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, url) -> Optional[CacheEntry]:
+        """Return the cached entry for `url` and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body_hash, etag, last_modified, content_type, fetched_at FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            body_hash, etag, last_modified, content_type, fetched_at = row
+            try:
+                with open(self._object_path(body_hash), "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._conn.commit()
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(url, body, etag, last_modified, content_type, fetched_at)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        fresh = time.time() - entry.fetched_at < self.ttl_for(entry.url)
+        if fresh:
+            self.stats["hits"] += 1
+        return fresh
+
+    def conditional_headers(self, entry: CacheEntry) -> dict:
+        """Validators to send when refetching a stale entry"""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Restart the TTL of an entry after the server answered 304 Not Modified"""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, last_access = ? WHERE url = ?",
+                (now, now, entry.url)
+            )
+            self._conn.commit()
+            self.stats["revalidated"] += 1
+
+    def store(self, url, body: bytes, headers) -> None:
+        """Store a 200 response body with its validators"""
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(body_hash)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+                self._total += len(body)
+
+            previous = self._conn.execute("SELECT body_hash, size FROM entries WHERE url = ?", (url,)).fetchone()
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body_hash, len(body), headers.get("ETag"), headers.get("Last-Modified"),
+                 headers.get("Content-Type"), now, now)
+            )
+            if previous and previous[0] != body_hash:
+                self._remove_object_if_unused(*previous)
+            self._conn.commit()
+            self.stats["stored"] += 1
+            self._evict()
+
+    def _remove_object_if_unused(self, body_hash, size):
+        in_use = self._conn.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone()
+        if in_use:
+            return
+        try:
+            os.remove(self._object_path(body_hash))
+            self._total -= size
+        except FileNotFoundError:
+            pass
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self):
+        """Drop least recently used entries until the bodies fit in `max_bytes`"""
+        while self._total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT url, body_hash, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            url, body_hash, size = row
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._remove_object_if_unused(body_hash, size)
+            self.stats["evicted"] += 1
+        self._conn.commit()
+
+    def close(self):
+        self.logger.info(f"Closing HTTP cache: {self.stats}")
+        with self._lock:
+            self._conn.close()
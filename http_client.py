@@ -0,0 +1,148 @@
+import os
+import itertools
+import threading
+import logging
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fake_useragent import UserAgent
+
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+
+class HTTPClient:
+    def __init__(self,
+                pool_size: int = 20,
+                max_per_host: int = 8,
+                keepalive_timeout: int = 60,
+                user_agent_pool_size: int = 50,
+                retries: int = 2):
+        """
+        Long-lived HTTP client shared by every scraper in the process.
+
+        Holds one `requests.Session` with a tuned connection pool, the
+        settings used to build aiohttp connectors, a precomputed pool of
+        User-Agent strings and counters for connection reuse.
+
+        Args:
+            pool_size: Maximum number of open connections across all hosts
+            max_per_host: Maximum number of open connections to a single host
+            keepalive_timeout: Seconds an idle connection is kept open (aiohttp)
+            user_agent_pool_size: Number of User-Agent strings to precompute
+            retries: Number of retries for connection errors
+        """
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('HTTPClient')
+
+        adapter = HTTPAdapter(
+            pool_connections=max(1, pool_size // max_per_host),
+            pool_maxsize=max_per_host,
+            max_retries=Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=0.5),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        self.user_agents = self._build_user_agent_pool(user_agent_pool_size)
+        self._user_agent_cycle = itertools.cycle(self.user_agents)
+        self._lock = threading.Lock()
+
+        # aiohttp connection counters, updated from trace callbacks
+        self._async_created = 0
+        self._async_reused = 0
+
+    def _build_user_agent_pool(self, size):
+        """Load fake_useragent once and keep a fixed rotation of distinct agents"""
+        ua = UserAgent()
+        agents = []
+        for _ in range(size * 3):
+            agent = ua.random
+            if agent not in agents:
+                agents.append(agent)
+            if len(agents) >= size:
+                break
+        return agents
+
+    def next_user_agent(self) -> str:
+        """Next User-Agent in the rotation"""
+        with self._lock:
+            return next(self._user_agent_cycle)
+
+    def make_connector(self) -> aiohttp.TCPConnector:
+        """Build an aiohttp connector using the same pool limits as the sync session"""
+        return aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+
+    def make_trace_config(self) -> aiohttp.TraceConfig:
+        """Trace config that feeds the aiohttp connection counters"""
+        async def on_create(session, context, params):
+            with self._lock:
+                self._async_created += 1
+
+        async def on_reuse(session, context, params):
+            with self._lock:
+                self._async_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def connection_stats(self) -> dict:
+        """Connections opened and reused by the sync session and the aiohttp connectors"""
+        created, requests_made = 0, 0
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    created += pool.num_connections
+                    requests_made += pool.num_requests
+        with self._lock:
+            return {
+                "sync_connections_created": created,
+                "sync_connections_reused": max(0, requests_made - created),
+                "async_connections_created": self._async_created,
+                "async_connections_reused": self._async_reused,
+            }
+
+    def close(self):
+        self.logger.info(f"Closing HTTP client: {self.connection_stats()}")
+        self.session.close()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Return the process-wide HTTP client.
+    Pool limits can be tuned with HTTP_POOL_SIZE, HTTP_MAX_PER_HOST and HTTP_KEEPALIVE.
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient(
+                pool_size=int(os.environ.get("HTTP_POOL_SIZE", 20)),
+                max_per_host=int(os.environ.get("HTTP_MAX_PER_HOST", 8)),
+                keepalive_timeout=int(os.environ.get("HTTP_KEEPALIVE", 60)),
+            )
+        return _shared_client
@@ -0,0 +1,119 @@
+from collections import deque
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    def __init__(self, keyword_groups: dict, case_insensitive: bool = False, word_boundary: bool = False):
+        """
+        Aho-Corasick automaton over groups of keywords.
+
+        All keywords of all groups are compiled once into a single trie with
+        failure links, so a text is scored against every group in one linear
+        pass instead of one substring search per keyword.
+
+        Args:
+            keyword_groups: {group_name: [keyword, ...]}, e.g. the industry mapper
+            case_insensitive: Match keywords regardless of case
+            word_boundary: Only match keywords that are not part of a longer word
+        """
+        self.groups = list(keyword_groups)
+        self.case_insensitive = case_insensitive
+        self.word_boundary = word_boundary
+
+        # keyword -> {group index: number of times the keyword is listed in that group}
+        weights = {}
+        for group_index, keywords in enumerate(keyword_groups.values()):
+            for keyword in keywords:
+                keyword = self.normalize(str(keyword))
+                group_weights = weights.setdefault(keyword, {})
+                group_weights[group_index] = group_weights.get(group_index, 0) + 1
+
+        self.keywords = list(weights)
+        self.weights = [list(weights[keyword].items()) for keyword in self.keywords]
+
+        # an empty keyword is contained in any text
+        self._always = [keyword_id for keyword_id, keyword in enumerate(self.keywords) if not keyword]
+        self._build([keyword_id for keyword_id, keyword in enumerate(self.keywords) if keyword])
+
+    def normalize(self, text):
+        return text.lower() if self.case_insensitive else text
+
+    def _build(self, keyword_ids):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for keyword_id in keyword_ids:
+            state = 0
+            for char in self.keywords[keyword_id]:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword_id)
+
+        # breadth first pass to set failure links and merge outputs
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _on_boundary(self, text, start, end):
+        """True if the match text[start:end] is not glued to a neighbouring word character"""
+        keyword = text[start:end]
+        if start > 0 and _is_word_char(keyword[0]) and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(keyword[-1]) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def find(self, text) -> set:
+        """Ids of the distinct keywords found in `text`"""
+        text = self.normalize(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set(self._always)
+        state = 0
+        if not self.word_boundary:
+            for char in text:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if output[state]:
+                    found.update(output[state])
+            return found
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                if keyword_id in found:
+                    continue
+                end = position + 1
+                if self._on_boundary(text, end - len(self.keywords[keyword_id]), end):
+                    found.add(keyword_id)
+        return found
+
+    def count(self, text) -> dict:
+        """
+        Number of matching keywords per group, in group order.
+        A keyword counts once per listing in its group, however often it appears in `text`.
+        """
+        counts = [0] * len(self.groups)
+        for keyword_id in self.find(text):
+            for group_index, weight in self.weights[keyword_id]:
+                counts[group_index] += weight
+        return {group: counts[index] for index, group in enumerate(self.groups) if counts[index]}
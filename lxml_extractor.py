@@ -0,0 +1,205 @@
+import os
+import json
+import logging
+from collections import OrderedDict
+
+from lxml import etree, html as lxml_html
+
+
+def _has_token(attribute, token):
+    """XPath predicate matching one whitespace separated token of an attribute"""
+    return f"contains(concat(' ', normalize-space(@{attribute}), ' '), ' {token} ')"
+
+
+# Selectors are compiled once at import time and reused for every page
+_FIRST_LINK = etree.XPath("(.//a[@href])[1]")
+_NEXT_LINK = etree.XPath(f"(.//a[@href][{_has_token('rel', 'next')}])[1]")
+_NOOPENER_LINK = etree.XPath(f"(.//a[@href][{_has_token('rel', 'noopener')}])[1]")
+_ALL_LINKS = etree.XPath(".//a")
+_HREF_LINKS = etree.XPath(".//a[@href]")
+_LABEL = etree.XPath(f"(.//div[{_has_token('class', 'label')}])[1]")
+_INFO_DIVS = etree.XPath(f".//div[{_has_token('class', 'info')}]")
+_COMPANY_NAME = etree.XPath("(.//div[@id='company_name'])[1]")
+_COMPANY_ADDRESS = etree.XPath("(.//div[@id='company_address'])[1]")
+_CITY_CONTENT = etree.XPath(f"((//section)[1]//div[{_has_token('class', 'content')}])[1]")
+
+
+def _first(selector, node):
+    found = selector(node)
+    return found[0] if found else None
+
+
+def _text(node):
+    """Equivalent of BeautifulSoup's `.text`, as a plain str"""
+    return str(node.text_content())
+
+
+def _contents(node):
+    """Equivalent of BeautifulSoup's `.contents`: text nodes and child elements in order"""
+    contents = [node.text] if node.text else []
+    for child in node:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+    return contents
+
+
+class BLLxmlExtractor:
+    def __init__(self, html_content, base_url):
+        """
+        Drop-in alternative to `BLDataExtractor` that parses once with lxml.
+
+        Every page is walked a single time to collect the divs the extractor
+        needs, then precompiled XPath selectors are run on those nodes only.
+        The returned data has the same shape as `BLDataExtractor`.
+
+        Args:
+            html_content: Raw page content (bytes or str)
+            base_url: Base URL prepended to relative links
+        """
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('BLLxmlExtractor')
+
+        self.root = lxml_html.fromstring(html_content)
+        self.base_url = base_url
+
+        self.current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.files_dir = os.path.join(self.current_dir, "files")
+        if not os.path.exists(self.files_dir):
+            self.logger.error(f"Files folder not found!")
+            raise Exception("Files folder not found!")
+
+    def _walk(self):
+        """
+        Single pass over every div of the page.
+        Returns all `company` divs, all `info` divs, the first div of every
+        other class, and the first `info` div following the phone block
+        (where the mobile numbers live).
+        """
+        companies, infos, firsts = [], [], {}
+        mobile = None
+        for div in self.root.iter("div"):
+            for cls in dict.fromkeys((div.get("class") or "").split()):
+                if cls == "company":
+                    companies.append(div)
+                elif cls == "info":
+                    infos.append(div)
+                    phone = firsts.get("phone")
+                    if mobile is None and phone is not None and div is not phone:
+                        mobile = div
+                elif cls not in firsts:
+                    firsts[cls] = div
+        return companies, infos, firsts, mobile
+
+    def extract_cities(self):
+        try:
+            content_w_cities = _first(_CITY_CONTENT, self.root)
+            city_data = {}
+            for link in _HREF_LINKS(content_w_cities):
+                city = (link.text or "").strip()
+                city_url = f"{self.base_url}{link.get('href')}"
+                city_data[city] = city_url
+
+            #reordeering
+            reordered_city_data = OrderedDict()
+            for city in ["Yaounde", "Douala", "Buea", "Kumba"]:
+                if city in city_data:
+                    reordered_city_data[city] = city_data[city]
+
+            for key, value in city_data.items():
+                if key not in reordered_city_data:
+                    reordered_city_data[key] = value
+
+            file_path = os.path.join(self.files_dir, "cities.json")
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(reordered_city_data, f, indent=4)
+
+            self.logger.info(f"City Data scrapped and stored successfully in cities.json!")
+        except Exception as e:
+            self.logger.error(f"Failed to get city info: {str(e)}")
+
+    def extract_companies(self, city):
+        try:
+            companies, _, firsts, _ = self._walk()
+            company_links = []
+            for company in companies:
+                link_tag = _first(_FIRST_LINK, company)
+                company_links.append(f"{self.base_url}{link_tag.get('href')}")
+
+            next_page_link = _first(_NEXT_LINK, firsts["scroller_with_ul"])
+            next_page_link = f"{self.base_url}{next_page_link.get('href')}" if next_page_link is not None else None
+
+            return next_page_link, company_links
+
+        except Exception as e:
+            self.logger.error(f"Failed to get companies for {city}: {str(e)}")
+
+    def extract_company_data(self):
+        try:
+            _, company_info, firsts, mobile_number_tag = self._walk()
+            latitude, longitude, company_site_link = "", "", ""
+
+            company_name = _first(_COMPANY_NAME, company_info[0])
+            if company_name is None:
+                return None
+            company_name = _text(company_name).strip()
+
+            company_address = _first(_COMPANY_ADDRESS, company_info[1])
+            company_address = _text(company_address) if company_address is not None else ""
+
+            company_geo_link = _first(_NOOPENER_LINK, company_info[1])
+            if company_geo_link is not None:
+                company_geo_link = company_geo_link.get("href").split("=")[1].split("&")[0].split(",")
+                latitude, longitude = company_geo_link[0], company_geo_link[1]
+
+            phone_numbers = []
+            if "phone" in firsts:
+                phone_numbers = [_text(number).strip() for number in _ALL_LINKS(firsts["phone"])]
+
+                if mobile_number_tag is not None:
+                    label_text = _text(_LABEL(mobile_number_tag)[0]).strip().lower()
+                    if label_text == "mobile phone":
+                        for number in _ALL_LINKS(mobile_number_tag):
+                            number = _text(number).strip()
+                            if number not in phone_numbers:
+                                phone_numbers.append(number)
+
+            if "weblinks" in firsts:
+                company_site_link = _NOOPENER_LINK(firsts["weblinks"])[0].get("href")
+                company_site_link = company_site_link.split("=")[-1].replace("%2f", "/").replace("%2F", "/")
+
+            company_description = ""
+            if "desc" in firsts:
+                company_description = _text(firsts["desc"]).strip()
+                #remove special characters
+                for char in ['\n', '\r', '\t', '\xa0', '\u200b']:
+                    company_description = company_description.replace(char, ' ')
+
+            size = ""
+            if "extra_info" in firsts:
+                for info in _INFO_DIVS(firsts["extra_info"]):
+                    label_text = _text(_LABEL(info)[0]).strip()
+                    if label_text.lower() == 'employees':
+                        size = _contents(info)[1].strip()
+                        break
+
+            all_tags = []
+            if "tags" in firsts:
+                all_tags = [_text(company_tag) for company_tag in _ALL_LINKS(firsts["tags"])]
+
+            company_data = {
+                "name": company_name,
+                "address": company_address if company_address else "",
+                "size": size if size else "",
+                "website": company_site_link if company_site_link else "",
+                "description": company_description if company_description else "",
+                "latitude": latitude if latitude else "",
+                "longitude": longitude if longitude else "",
+                "contact_numbers": phone_numbers if phone_numbers else "",
+                "tags": all_tags if all_tags else ""
+            }
+            return company_data
+
+        except Exception as e:
+            self.logger.error(f"Error Getting Company Data: {str(e)}")
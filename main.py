@@ -1,56 +1,63 @@
 import os
 import requests
+from requests.structures import CaseInsensitiveDict
 import json
+import queue
+import threading
 from time import sleep
-import random
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict
 import logging
-from fake_useragent import UserAgent
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 from database import MongoDataHandler
 from classifier import IndustryClassifier
 
-from google_handler import initiator
+from google_handler import initiator, setup_driver, apply_lean_profile, network_totals, card_stats
+from fetch_engine import AsyncFetchEngine
+from rate_limiter import get_rate_limiter
+from http_client import get_http_client
+from http_cache import HTTPCache
+from lxml_extractor import BLLxmlExtractor
+from pipeline import CompanyPipeline
+from write_behind import WriteBehindQueue
+from checkpoint import CheckpointJournal
+from frontier import URLFrontier
+from driver_pool import ChromeDriverPool
+from tab_pool import TabPool
 
 load_dotenv()
 
 class EntityScraper:
-    def __init__(self, base_delay=3, max_delay=10):
+    def __init__(self, client=None, rate_limiter=None, cache=None):
         """
-        Initialize scraper with configurable delays and tracking
+        Initialize scraper on top of the shared HTTP client and rate limiter
         
         Args:
-            base_delay (int): Minimum delay between requests in seconds
-            max_delay (int): Maximum delay between requests in seconds
+            client (HTTPClient): Client to borrow the session from, defaults to the process-wide one
+            rate_limiter (DomainRateLimiter): Limiter to use, defaults to the process-wide one
+            cache (HTTPCache): Optional on-disk cache, pages are always fetched when None
         """
-        self.session = requests.Session()
-        self.base_delay = base_delay
-        self.max_delay = max_delay
-        self.last_requests = defaultdict(datetime.now)
-        self.ua = UserAgent()
+        self.client = client or get_http_client()
+        self.session = self.client.session
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.cache = cache
         
         # Configure logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('EntityScraper')
-        
-        # Set default headers
-        self.session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-        })
 
     def _get_domain(self, url):
         """Extract domain from URL"""
         return urlparse(url).netloc
 
-    def _update_user_agent(self):
-        """Rotate user agent"""
-        self.session.headers['User-Agent'] = self.ua.random
+    def _user_agent_headers(self, headers=None):
+        """Rotate user agent per request, the shared session headers stay untouched"""
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', self.client.next_user_agent())
+        return headers
 
     def _respect_robots(self, url):
         """
@@ -60,32 +67,41 @@ class EntityScraper:
         # Implementation would go here
         return True
 
+    def _cached_response(self, entry):
+        """Build a `requests.Response` from a cache entry"""
+        response = requests.Response()
+        response.url = entry.url
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(entry.headers())
+        response._content = entry.body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
     def get(self, url, **kwargs):
         """
         Make a GET request with built-in delays and rotating user agents
         """
-        domain = self._get_domain(url)
-        
-        # Check time since last request to this domain
-        time_since_last = datetime.now() - self.last_requests[domain]
-        if time_since_last < timedelta(seconds=self.base_delay):
-            sleep_time = self.base_delay - time_since_last.total_seconds()
-            self.logger.info(f"Sleeping for {sleep_time:.2f}s to respect rate limits")
-            sleep(sleep_time)
-        
-        # Add jitter to avoid detection
-        jitter = random.uniform(0, self.max_delay - self.base_delay)
-        sleep(jitter)
-        
-        # Update tracking
-        self.last_requests[domain] = datetime.now()
+        # Serve fresh pages from disk, revalidate stale ones
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            return self._cached_response(entry)
+
+        # Wait only if the domain has used up its request budget
+        self.rate_limiter.acquire(self._get_domain(url))
         
         # Rotate user agent
-        self._update_user_agent()
+        kwargs["headers"] = self._user_agent_headers(kwargs.get("headers"))
+        if entry:
+            kwargs["headers"].update(self.cache.conditional_headers(entry))
         
         try:
             response = self.session.get(url, **kwargs)
+            if entry and response.status_code == 304:
+                self.cache.refresh(entry)
+                return self._cached_response(entry)
             response.raise_for_status()
+            if self.cache:
+                self.cache.store(url, response.content, response.headers)
             return response
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching {url}: {str(e)}")
@@ -260,10 +276,35 @@ class BLDataExtractor:
         except Exception as e:
             self.logger.error(f"Error Getting Company Data: {str(e)}")
             
+EXTRACTION_ENGINES = {
+    "bs4": BLDataExtractor,
+    "lxml": BLLxmlExtractor,
+}
+
+# listing pages change as companies are added, company pages rarely do
+BL_CACHE_TTL_RULES = [
+    (r"/company/", 30 * 24 * 60 * 60),
+    (r"/location/", 24 * 60 * 60),
+]
+
 class BLFlowHandler:
-    def __init__(self, base_url):
+    def __init__(self, base_url, fetch_concurrency=8, http_cache=False, engine="bs4", pipeline=False, pipeline_options=None, lookahead=1, write_behind=False):
         self.base_url = base_url
 
+        #number of listing pages fetched ahead of the one being processed
+        self.lookahead = lookahead
+
+        #extraction engine: "bs4" (BLDataExtractor) or "lxml" (BLLxmlExtractor)
+        if engine not in EXTRACTION_ENGINES:
+            raise ValueError(f"Unknown extraction engine: {engine}")
+        self.engine = engine
+
+        #opt-in disk cache for listing and company pages
+        self.http_cache = HTTPCache(ttl_rules=BL_CACHE_TTL_RULES) if http_cache else None
+
+        #one scraper for every listing page fetch, on the process-wide HTTP client
+        self.scraper = EntityScraper(cache=self.http_cache)
+
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.files_dir = os.path.join(self.current_dir, "files")
         if not os.path.exists(self.files_dir):
@@ -274,6 +315,19 @@ class BLFlowHandler:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('BLFlowHandler')
 
+        #async engine for fetching company pages concurrently
+        self.fetch_engine = AsyncFetchEngine(concurrency=fetch_concurrency, cache=self.http_cache)
+
+        #optional fetch -> parse -> persist pipeline, parsing runs in worker processes
+        self.pipeline = None
+        if pipeline:
+            self.pipeline = CompanyPipeline(
+                fetch=self.fetch_engine.get,
+                extractor_cls=EXTRACTION_ENGINES[self.engine],
+                base_url=self.base_url,
+                **(pipeline_options or {})
+            )
+
         #configure for industry mapper
         self.industry_maps = IndustryClassifier()
 
@@ -290,39 +344,67 @@ class BLFlowHandler:
         self.new_company_inserter = MongoDataHandler(
             connection_string= os.environ["CONN_STRING"],
             database_name= os.environ["DB_NAME"],
-            collection_name= os.environ["COMPANY_COLLECTION"]
+            collection_name= os.environ["COMPANY_COLLECTION"],
+            buffer_size=100,
+            max_wait_time=30,
+            bulk_write=True,  # ids are assigned client side, inserts are batched
+            background_flush=True
         )
 
         #configure connection for inserting in location collection
         self.location_inserter = MongoDataHandler(
             connection_string= os.environ["CONN_STRING"],
             database_name= os.environ["DB_NAME"],
-            collection_name= os.environ["LOCATION_COLLECTION"]
+            collection_name= os.environ["LOCATION_COLLECTION"],
+            buffer_size=100,
+            max_wait_time=30,
+            bulk_write=True,  # companies reference the preassigned location id
+            background_flush=True
         )
 
         #configure connection for inserting in industry collection
         self.industry_inserter = MongoDataHandler(
             connection_string= os.environ["CONN_STRING"],
             database_name= os.environ["DB_NAME"],
-            collection_name= os.environ["INDUSTRY_COLLECTION"]
+            collection_name= os.environ["INDUSTRY_COLLECTION"],
+            name_cache=True
         )
 
+        #progress journal shared by the BL and Google flows, seeded once from the legacy scrapped_cities.json
+        self.checkpoint = CheckpointJournal()
+        self._seed_checkpoint()
+
+        #pending listing/company URLs and seen-set of the BL crawl, kept on disk across runs
+        self.frontier = URLFrontier()
+
+        #optional write-behind queue for location and company documents, spills to files/ when MongoDB is down
+        self.write_behind = WriteBehindQueue([self.location_inserter, self.new_company_inserter]) if write_behind else None
+
     def _scraper(self, working_url):
-        scraper = EntityScraper(base_delay=3, max_delay=7)
-        response = scraper.get(working_url)
+        # the handler's scraper, so listing pages go through the HTTP cache as well
+        response = self.scraper.get(working_url)
         return response
     
+    def _make_extractor(self, response):
+        return EXTRACTION_ENGINES[self.engine](html_content=response.content, base_url=self.base_url)
+
     def _extract_companies(self, response, city):
-        extractor =  BLDataExtractor(html_content=response.content, base_url=self.base_url)
+        extractor =  self._make_extractor(response)
         next_page_link, company_links = extractor.extract_companies(city)
         return next_page_link, company_links
     
     def _extract_company_data(self, response):
-        extractor =  BLDataExtractor(html_content=response.content, base_url=self.base_url)
+        extractor =  self._make_extractor(response)
         company_data = extractor.extract_company_data()
         return company_data
     
-    def _organise_company_data(self, company_data, city, states):
+    def _industry_input(self, company_data):
+        """(map_data, checker) the classifier scores for a company"""
+        if company_data["tags"] == "":
+            return company_data["description"], "desc"
+        return company_data["tags"], "tags"
+
+    def _organise_company_data(self, company_data, city, states, industry=None, on_stored=None):
         location_data = {
             "country": "Cameroon",
             "city": city,
@@ -333,11 +415,9 @@ class BLFlowHandler:
             "created_at": datetime.now(timezone.utc)
         }
 
-        location_id = self.location_inserter.insert_document(location_data)
-        if company_data["tags"] == "":
-            industry = self.industry_maps.classify_company(company_data["description"], "desc")
-        else:
-            industry = self.industry_maps.classify_company(company_data["tags"], "tags")
+        location_id = self.location_inserter.insert_document(location_data, on_stored=on_stored)
+        if industry is None:
+            industry = self.industry_maps.classify_company(*self._industry_input(company_data))
         industry_id = self.industry_inserter.check_and_create_document(industry)
 
         updated_company_data = {
@@ -346,6 +426,8 @@ class BLFlowHandler:
             "revenue": "",
             "website": company_data["website"],
             "description": company_data["description"],
+            # kept so reclassify.py can rebuild the classifier input
+            "tags": company_data["tags"],
             "contact_numbers": company_data["contact_numbers"],
             "location_id": location_id,
             "industry_id": industry_id,
@@ -353,19 +435,135 @@ class BLFlowHandler:
         }
         return updated_company_data
     
-    def _handle_company_flow(self, working_url, city, states):
-        response = self._scraper(working_url)
-        next_page_link, company_links = self._extract_companies(response, city)
-        for link in company_links:
-            sleep(random.uniform(1, 3))
-            response = self._scraper(link)
-            company_data = self._extract_company_data(response)
+    def flush_writes(self) -> bool:
+        """
+        Write out buffered locations and companies, so city progress recorded right
+        after is backed by the database. False if a batch could not be written yet.
+        """
+        if self.write_behind:
+            self.write_behind.flush()
+            return True
+        return self.location_inserter.flush_buffer() and self.new_company_inserter.flush_buffer()
 
+    def _seed_checkpoint(self):
+        file_path = os.path.join(self.files_dir, "scrapped_cities.json")
+        if not os.path.exists(file_path):
+            return
+        with open(file_path) as f:
+            scrapped_cities = json.load(f)
+        # the BL flow stored the city URL, the Google flow its search query (written before the city was done)
+        self.checkpoint.seed("bl", "city", [city for city, value in scrapped_cities.items() if str(value).startswith("http")])
+
+    def _persist_company(self, link, company_data, city, states, industry=None):
+        # the link is only retired once its buffered location document is written
+        updated_company_data = self._organise_company_data(
+            company_data, city, states, industry=industry,
+            on_stored=lambda: self.frontier.mark_seen(link)
+        )
+        # status = self.company_inserter.add_document(updated_company_data)
+        return updated_company_data
+
+    def _process_company_links(self, company_links, city, states):
+        # companies finished by an interrupted run are not fetched again
+        company_links = [link for link in company_links if not self.frontier.seen(link)]
+
+        if self.pipeline:
+            self.pipeline.run(
+                company_links,
+                lambda link, company_data: self._persist_company(link, company_data, city, states),
+                on_failed=self.frontier.mark_failed
+            )
+            return
+
+        # fetch every company page of the listing concurrently
+        responses = self.fetch_engine.fetch_many(company_links)
+        companies = []
+        for link, response in zip(company_links, responses):
+            if response is None:
+                self.logger.error(f"Skipping {link}, page could not be fetched")
+                self.frontier.mark_failed(link, "fetch: no response")
+                continue
+            company_data = self._extract_company_data(response)
             if company_data:
-                updated_company_data = self._organise_company_data(company_data, city, states)
-                # status = self.company_inserter.add_document(updated_company_data)
-        return next_page_link
+                companies.append((link, company_data))
+            else:
+                self.frontier.mark_failed(link, "parse: no company data")
+
+        # classify the whole page at once, repeated inputs are scored once
+        industries = self.industry_maps.classify_many([self._industry_input(company_data) for _, company_data in companies])
+        for (link, company_data), industry in zip(companies, industries or [None] * len(companies)):
+            self._persist_company(link, company_data, city, states, industry=industry)
+
+    def _queue_listing_page(self, next_page_link, company_links, city):
+        """Persist what a listing page discovered before any of it is processed"""
+        self.frontier.push(company_links or [], "company", city)
+        if next_page_link:
+            self.frontier.push([next_page_link], "listing", city)
+
+    def _resume_url(self, city, city_link, states):
+        """
+        Listing page to start `city` from, None if all its pages are done.
+        Company pages left pending by an interrupted run are processed first.
+        """
+        leftover = self.frontier.pending("company", city)
+        if leftover:
+            self.logger.info(f"Resuming {len(leftover)} pending company pages for {city}")
+            self._process_company_links(leftover, city, states)
+
+        if not self.frontier.seen(city_link):
+            self.frontier.push([city_link], "listing", city)
+        pending_pages = self.frontier.pending("listing", city)
+        return pending_pages[0] if pending_pages else None
 
+    def _iter_listing_pages(self, start_url, city):
+        """
+        Yield (page_url, next_page_link, company_links) for every listing page of a city.
+
+        With a look-ahead, a background thread follows the `next` links and
+        keeps up to `self.lookahead` pages fetched beyond the one currently
+        being processed. Fetches still go through the shared rate limiter.
+        """
+        if self.lookahead <= 0:
+            page_url = start_url
+            while page_url:
+                response = self._scraper(page_url)
+                next_page_link, company_links = self._extract_companies(response, city)
+                yield page_url, next_page_link, company_links
+                page_url = next_page_link
+            return
+
+        pages = queue.Queue()
+        slots = threading.Semaphore(self.lookahead + 1)
+        stop = threading.Event()
+
+        def prefetch():
+            page_url = start_url
+            try:
+                while page_url and not stop.is_set():
+                    # wait until fewer than lookahead pages are waiting
+                    if not slots.acquire(timeout=1):
+                        continue
+                    response = self._scraper(page_url)
+                    next_page_link, company_links = self._extract_companies(response, city)
+                    pages.put((page_url, next_page_link, company_links))
+                    page_url = next_page_link
+                pages.put(None)
+            except Exception as e:
+                pages.put(e)
+
+        prefetcher = threading.Thread(target=prefetch, name=f"prefetch-{city}", daemon=True)
+        prefetcher.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+                slots.release()
+        finally:
+            stop.set()
 
     def start_company_flow(self):
         try:
@@ -377,29 +575,24 @@ class BLFlowHandler:
             with open(file_path) as f:
                 states = json.load(f)
             
-            city_links = list(cities.values())
-            all_cities = list(cities.keys())
-
-            file_path = os.path.join(self.files_dir, "scrapped_cities.json")
-            with open(file_path) as f:
-                scrapped_cities = json.load(f)
-
-            for i in range(len(city_links)):
-                if all_cities[i] not in scrapped_cities:
-                    next_page_link = self._handle_company_flow(city_links[i], all_cities[i], states)
-                    while True:
-                        if next_page_link:
-                            sleep(random.uniform(1, 3))
-                            next_page_link = self._handle_company_flow(next_page_link, all_cities[i], states)
-                        else:
-                            break
-                    
-                    scrapped_cities[all_cities[i]] = city_links[i]
-                    file_path = os.path.join(self.files_dir, "scrapped_cities.json")
-                    with open(file_path, 'w') as f:
-                        json.dump(scrapped_cities, f, indent=4)
-
-                    self.logger.info(f"DONE WITH {all_cities[i]}!!")
+            for city, city_link in cities.items():
+                if self.checkpoint.is_done("bl", "city", city):
+                    continue
+
+                # pick up from the first unfinished listing page of an interrupted run
+                start_url = self._resume_url(city, city_link, states)
+                if start_url:
+                    for page_url, next_page_link, company_links in self._iter_listing_pages(start_url, city):
+                        self._queue_listing_page(next_page_link, company_links, city)
+                        self._process_company_links(company_links, city, states)
+                        self.frontier.mark_seen(page_url)
+
+                # company links still waiting on their writes keep the city open for the next run
+                if not self.flush_writes():
+                    self.logger.error(f"Writes for {city} could not be flushed, it will be resumed")
+                    continue
+                self.checkpoint.mark("bl", "city", city, url=city_link)
+                self.logger.info(f"DONE WITH {city}!!")
             
             self.logger.info(f"DONE SCRAPPING ALL CITIES IN `cities.json`!!")
 
@@ -408,8 +601,21 @@ class BLFlowHandler:
 
             #close all open connections
             # self.company_inserter.close_connection()
+            if self.write_behind:
+                self.write_behind.close()
+            self.new_company_inserter.close_connection()
             self.location_inserter.close_connection()
             self.industry_inserter.close_connection()
+            self.logger.info(f"Location write stats: {self.location_inserter.flush_stats()}")
+            self.checkpoint.close()
+            self.frontier.close()
+            if self.pipeline:
+                self.pipeline.close()
+            self.fetch_engine.close()
+            if self.http_cache:
+                self.http_cache.close()
+            self.logger.info(f"HTTP connection stats: {self.scraper.client.connection_stats()}")
+            self.logger.info(f"Classification cache stats: {self.industry_maps.cache_stats()}")
 
             # print(f"BUFFER: {self.company_inserter.buffer}\n")
 
@@ -420,7 +626,12 @@ class BLFlowHandler:
 
 def  bl_runner(scraper):
     base_url = os.environ["BL_BASE_URL"]
-    handler = BLFlowHandler(base_url=base_url)
+    use_cache = os.environ.get("HTTP_CACHE", "").lower() in ("1", "true", "yes")
+    engine = os.environ.get("BL_EXTRACTION_ENGINE", "bs4")
+    use_pipeline = os.environ.get("BL_PIPELINE", "").lower() in ("1", "true", "yes")
+    lookahead = int(os.environ.get("BL_LOOKAHEAD", 1))
+    write_behind = os.environ.get("WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+    handler = BLFlowHandler(base_url=base_url, http_cache=use_cache, engine=engine, pipeline=use_pipeline, lookahead=lookahead, write_behind=write_behind)
     cities_url = f"{base_url}/browse-business-cities"
 
     try:
@@ -434,7 +645,6 @@ def  bl_runner(scraper):
             # Process response here
             extractor =  BLDataExtractor(html_content=response.content, base_url=base_url)
             extractor.extract_cities()
-            sleep(random.uniform(1, 3))  # Additional delay between pages
             
             handler.start_company_flow()
         else:
@@ -448,9 +658,30 @@ def  bl_runner(scraper):
 def google_runner(scraper):
     base_url = os.environ["GGLE_BASE_URL"]
     # base_url = os.environ["BL_BASE_URL"]
-    handler = BLFlowHandler(base_url=base_url)
+    write_behind = os.environ.get("WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+    handler = BLFlowHandler(base_url=base_url, write_behind=write_behind)
+    driver_pool = None
+    tab_pool = None
 
     try:
+        if os.environ.get("GOOGLE_TABS", "").lower() in ("1", "true", "yes"):
+            # one Chrome loading company detail pages in several tabs, as many as memory allows
+            tab_pool = TabPool(
+                setup_driver,
+                max_tabs=int(os.environ.get("GOOGLE_MAX_TABS", 4)),
+                mb_per_tab=int(os.environ.get("GOOGLE_MB_PER_TAB", 150)),
+                max_pages_per_driver=int(os.environ.get("GOOGLE_TAB_MAX_PAGES", 200)),
+                on_reset=apply_lean_profile
+            )
+        else:
+            # warm Chrome instances reused for every company detail page
+            driver_pool = ChromeDriverPool(
+                setup_driver,
+                size=int(os.environ.get("GOOGLE_DRIVER_POOL_SIZE", 1)),
+                max_pages_per_driver=int(os.environ.get("GOOGLE_DRIVER_MAX_PAGES", 50)),
+                on_reset=apply_lean_profile
+            )
+
         print("In try")
         current_dir = os.path.dirname(os.path.abspath(__file__))
         files_dir = os.path.join(current_dir, "files")
@@ -465,7 +696,6 @@ def google_runner(scraper):
             print(f"Successfully scraped {cities_url}")
             extractor =  BLDataExtractor(html_content=response.content, base_url=base_url)
             extractor.extract_cities()
-            sleep(random.uniform(1, 3))  # Additional delay between pages
 
             file_path = os.path.join(files_dir, "cities.json")
             with open(file_path) as f:
@@ -474,18 +704,17 @@ def google_runner(scraper):
             with open(states_file_path) as f:
                 states = json.load(f)
             
-            scrapped_cities_file_path = os.path.join(files_dir, "scrapped_cities.json")
-            with open(scrapped_cities_file_path) as f:
-                scrapped_cities = json.load(f)
-            
             all_cities = list(cities.keys())
             for city in all_cities:
+                # a city is only marked once initiator went through all of it
+                if handler.checkpoint.is_done("google", "city", city):
+                    continue
                 query = f"companies in {city}"
-                file_path = os.path.join(files_dir, "scrapped_cities.json")
-                scrapped_cities[city] = query
-                result_status = initiator(query, city, handler, states, file_path, scrapped_cities, handler.new_company_inserter)
+                result_status = initiator(query, city, handler, states, handler.checkpoint, handler.new_company_inserter, driver_pool, tab_pool=tab_pool)
 
-                if result_status:
+                # companies still buffered must reach the database before the city counts as done
+                if result_status and handler.flush_writes():
+                    handler.checkpoint.mark("google", "city", city, query=query)
                     print(f"DONE WITH {city}!!")
                 else:
                     print(f"FAILED TO COMPLETE {city}!!")
@@ -516,19 +745,18 @@ def google_runner(scraper):
             with open(states_file_path) as f:
                 states = json.load(f)
 
-            scrapped_cities_file_path = os.path.join(files_dir, "scrapped_cities.json")
-            with open(scrapped_cities_file_path) as f:
-                scrapped_cities = json.load(f)
-            
             all_cities = list(cities.keys())
             for city in all_cities:
+                # a city is only marked once initiator went through all of it
+                if handler.checkpoint.is_done("google", "city", city):
+                    continue
                 query = f"companies in {city}"
-                file_path = os.path.join(files_dir, "scrapped_cities.json")
-                scrapped_cities[city] = query
             
-                result_status = initiator(query, city, handler, states, file_path, scrapped_cities, handler.new_company_inserter)
+                result_status = initiator(query, city, handler, states, handler.checkpoint, handler.new_company_inserter, driver_pool, tab_pool=tab_pool)
 
-                if result_status:
+                # companies still buffered must reach the database before the city counts as done
+                if result_status and handler.flush_writes():
+                    handler.checkpoint.mark("google", "city", city, query=query)
                     print(f"DONE WITH {city}!!")
                 else:
                     print(f"FAILED TO COMPLETE {city}!!")
@@ -557,17 +785,31 @@ def google_runner(scraper):
 
         #close all open connections
         # handler.company_inserter.close_connection()
+        if handler.write_behind:
+            handler.write_behind.close()
         handler.new_company_inserter.close_connection()
         handler.location_inserter.close_connection()
         handler.industry_inserter.close_connection()
+        handler.fetch_engine.close()
+        handler.checkpoint.close()
+        print(f"Classification cache stats: {handler.industry_maps.cache_stats()}")
+        print(f"Driver pool stats: {(tab_pool or driver_pool).stats}")
+        print(f"Browser network totals: {network_totals}")
+        print(f"Place sources: {card_stats}")
+        print(f"Company write stats: {handler.new_company_inserter.flush_stats()}")
 
     except Exception as e:
         print(e)
         # pass
+    finally:
+        if driver_pool:
+            driver_pool.close()
+        if tab_pool:
+            tab_pool.close()
 
 if __name__ == "__main__":
     try:
-        scraper = EntityScraper(base_delay=3, max_delay=7)
+        scraper = EntityScraper()
         # bl_runner(scraper)
         google_runner(scraper)
     except Exception as e:
@@ -0,0 +1,150 @@
+"""
+Decoders for the JSON payloads Google Maps loads for search results and
+place details, so the Google flow can read company data without waiting on
+the rendered DOM.
+
+Payloads are nested arrays without field names; the index paths below are
+where the current Maps client keeps each value and are the only thing to
+update when Google reshuffles them.
+
+    python maps_payload.py place saved_place_payload.txt [city]
+    python maps_payload.py search saved_search_payload.txt [city]
+
+Anonymised payloads in tests/fixtures pin the paths down:
+
+    python -m unittest discover -s tests -t .
+"""
+import re
+import sys
+import json
+from urllib.parse import urlparse, parse_qs
+
+XSSI_PREFIX = ")]}'"
+
+# Place array -> value
+NAME_PATH = (11,)
+CATEGORY_PATH = (13, 0)
+# (18,) is "name, address", the name is stripped
+ADDRESS_PATHS = [(39,), (18,)]
+PHONE_PATHS = [(178, 0, 0), (178, 0, 3)]
+WEBSITE_PATH = (7, 0)
+LATITUDE_PATH = (9, 2)
+LONGITUDE_PATH = (9, 3)
+FEATURE_ID_PATH = (10,)
+
+# Payload -> place array(s)
+PLACE_IN_PLACE_PAYLOAD = (6,)
+RESULTS_IN_SEARCH_PAYLOAD = (0, 1)
+PLACE_IN_SEARCH_RESULT = (14,)
+
+# window.APP_INITIALIZATION_STATE -> payload string embedded in a directly loaded page
+PLACE_IN_INIT_STATE = (3, 6)
+SEARCH_IN_INIT_STATE = (3, 2)
+
+FEATURE_ID_PATTERN = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+
+
+def get_path(data, path, default=None):
+    """data[path[0]][path[1]]..., `default` as soon as a step is missing"""
+    for index in path:
+        try:
+            data = data[index]
+        except (IndexError, KeyError, TypeError):
+            return default
+        if data is None:
+            return default
+    return data
+
+
+def strip_xssi(text):
+    """
+    JSON value of a Maps response body.
+
+    Handles the bare `)]}'` prefixed body of place requests and the
+    `{"c":0,"d":")]}'..."}/*""*/` envelope of search requests.
+    """
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    if text.startswith("{"):
+        envelope = json.loads(text)
+        text = envelope.get("d", "")
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return json.loads(text)
+
+
+def feature_id(place_url):
+    """Feature id ("0x...:0x...") in a place URL, the key shared with decoded places"""
+    match = FEATURE_ID_PATTERN.search(place_url or "")
+    return match.group(1) if match else None
+
+
+def _website(url):
+    # some links go through a google redirect, the target is its `q` parameter
+    if url and url.startswith("/url?"):
+        return parse_qs(urlparse(url).query).get("q", [url])[0]
+    return url
+
+
+def decode_place(place, city=None) -> dict:
+    """company_info dict (as built by google_handler) from one place array"""
+    name = get_path(place, NAME_PATH)
+    address = next((get_path(place, path) for path in ADDRESS_PATHS if get_path(place, path)), None)
+    if address and name and address.startswith(f"{name}, "):
+        address = address[len(name) + 2:]
+    if address and city:
+        address = address.replace(f", {city}", "").strip()
+    phone = next((get_path(place, path) for path in PHONE_PATHS if get_path(place, path)), None)
+    latitude = get_path(place, LATITUDE_PATH)
+    longitude = get_path(place, LONGITUDE_PATH)
+
+    return {
+        'name': name,
+        'address': address,
+        'contact_numbers': [phone],
+        'website': _website(get_path(place, WEBSITE_PATH)),
+        'size': "",
+        'tags': "",
+        'description': get_path(place, CATEGORY_PATH),
+        'latitude': str(latitude) if latitude is not None else None,
+        'longitude': str(longitude) if longitude is not None else None
+    }
+
+
+def decode_place_payload(text, city=None):
+    """company_info of a place details payload, None if it holds no place"""
+    place = get_path(strip_xssi(text), PLACE_IN_PLACE_PAYLOAD)
+    if not place:
+        return None
+    return decode_place(place, city)
+
+
+def decode_search_payload(text, city=None) -> dict:
+    """{feature id: company_info} for every result of a search payload"""
+    places = {}
+    results = get_path(strip_xssi(text), RESULTS_IN_SEARCH_PAYLOAD, [])
+    for result in results:
+        place = get_path(result, PLACE_IN_SEARCH_RESULT)
+        if not isinstance(place, list):
+            continue
+        key = get_path(place, FEATURE_ID_PATH)
+        if key:
+            places[key] = decode_place(place, city)
+    return places
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("place", "search"):
+        print(__doc__)
+        sys.exit(1)
+    with open(sys.argv[2], encoding="utf-8") as f:
+        payload = f.read()
+    city = sys.argv[3] if len(sys.argv) > 3 else None
+    if sys.argv[1] == "place":
+        decoded = decode_place_payload(payload, city)
+    else:
+        decoded = decode_search_payload(payload, city)
+    print(json.dumps(decoded, indent=4, ensure_ascii=False))
@@ -0,0 +1,175 @@
+import os
+import queue
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Marks the end of the work for one worker of the next stage
+_DONE = object()
+
+
+def parse_company_page(extractor_cls, html_content, base_url):
+    """Parser stage entry point, runs inside a worker process"""
+    extractor = extractor_cls(html_content=html_content, base_url=base_url)
+    return extractor.extract_company_data()
+
+
+class CompanyPipeline:
+    def __init__(self,
+                fetch,
+                extractor_cls,
+                base_url: str,
+                fetch_workers: int = 4,
+                parse_workers: int = None,
+                persist_workers: int = 2,
+                queue_size: int = 32):
+        """
+        Staged fetch -> parse -> persist pipeline for company pages.
+
+        Fetcher threads feed raw HTML into a bounded queue, parser threads
+        hand each page to a `ProcessPoolExecutor` running the extractor, and
+        persister threads store the parsed data. Bounded queues give
+        backpressure: when persistence falls behind, parsing and then
+        fetching pause instead of piling pages up in memory.
+
+        Args:
+            fetch: Callable(url) returning a response with `.content`
+            extractor_cls: Extractor class (`BLDataExtractor` or `BLLxmlExtractor`)
+            base_url: Base URL passed to the extractor
+            fetch_workers: Number of concurrent fetches
+            parse_workers: Number of parser processes, defaults to the CPU count
+            persist_workers: Number of persistence threads
+            queue_size: Capacity of each queue between two stages
+        """
+        self.fetch = fetch
+        self.extractor_cls = extractor_cls
+        self.base_url = base_url
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.persist_workers = persist_workers
+        self.queue_size = queue_size
+        self._executor = None
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('CompanyPipeline')
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._executor
+
+    def _run_stage(self, name, workers, target, *args):
+        threads = [
+            threading.Thread(target=target, args=args, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _close_stage(self, threads, next_queue, next_count):
+        """Wait for a stage to finish, then tell every worker of the next stage to stop"""
+        for thread in threads:
+            thread.join()
+        for _ in range(next_count):
+            next_queue.put(_DONE)
+
+    def _fetcher(self, url_queue, raw_queue, count, fail):
+        while True:
+            url = url_queue.get()
+            if url is _DONE:
+                return
+            try:
+                response = self.fetch(url)
+            except Exception as e:
+                self.logger.error(f"Fetch failed for {url}: {str(e)}")
+                fail(url, f"fetch: {str(e)}")
+                continue
+            count("fetched")
+            raw_queue.put((url, response.content))
+
+    def _parser(self, executor, raw_queue, parsed_queue, count, fail):
+        while True:
+            item = raw_queue.get()
+            if item is _DONE:
+                return
+            url, html_content = item
+            try:
+                company_data = executor.submit(parse_company_page, self.extractor_cls, html_content, self.base_url).result()
+            except Exception as e:
+                self.logger.error(f"Parse failed for {url}: {str(e)}")
+                fail(url, f"parse: {str(e)}")
+                continue
+            if company_data:
+                count("parsed")
+                parsed_queue.put((url, company_data))
+            else:
+                fail(url, "parse: no company data")
+
+    def _persister(self, parsed_queue, persist, count, fail):
+        while True:
+            item = parsed_queue.get()
+            if item is _DONE:
+                return
+            url, company_data = item
+            try:
+                persist(url, company_data)
+                count("persisted")
+            except Exception as e:
+                self.logger.error(f"Persist failed for {url}: {str(e)}")
+                # left pending, a write failure is retried on the next run
+                count("failed")
+
+    def run(self, urls, persist, on_failed=None) -> dict:
+        """
+        Push `urls` through the pipeline and block until all are persisted.
+
+        Args:
+            urls: Company page URLs to process
+            persist: Callable(url, company_data) run for every parsed company
+            on_failed: Optional callable(url, reason) run for every page that could not
+                be fetched or parsed
+
+        Returns:
+            Counts of fetched, parsed, persisted and failed pages
+        """
+        url_queue = queue.Queue()
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        parsed_queue = queue.Queue(maxsize=self.queue_size)
+        stats = {"fetched": 0, "parsed": 0, "persisted": 0, "failed": 0}
+        stats_lock = threading.Lock()
+
+        def count(key):
+            with stats_lock:
+                stats[key] += 1
+
+        def fail(url, reason):
+            count("failed")
+            if on_failed is not None:
+                on_failed(url, reason)
+
+        for url in urls:
+            url_queue.put(url)
+        for _ in range(self.fetch_workers):
+            url_queue.put(_DONE)
+
+        executor = self._get_executor()
+        fetchers = self._run_stage("fetch", self.fetch_workers, self._fetcher, url_queue, raw_queue, count, fail)
+        parsers = self._run_stage("parse", self.parse_workers, self._parser, executor, raw_queue, parsed_queue, count, fail)
+        persisters = self._run_stage("persist", self.persist_workers, self._persister, parsed_queue, persist, count, fail)
+
+        self._close_stage(fetchers, raw_queue, self.parse_workers)
+        self._close_stage(parsers, parsed_queue, self.persist_workers)
+        for thread in persisters:
+            thread.join()
+
+        self.logger.info(f"Pipeline finished: {stats}")
+        return stats
+
+    def close(self):
+        """Shut down the parser processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
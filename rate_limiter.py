@@ -0,0 +1,111 @@
+import os
+import asyncio
+import threading
+import time
+import logging
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        """
+        Token bucket refilled continuously at `rate` tokens per second.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            burst: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before using it.
+        Tokens may go negative so concurrent callers queue up in order.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class DomainRateLimiter:
+    def __init__(self, rate: float = 1 / 3, burst: int = 3, overrides: dict = None):
+        """
+        Per-domain token-bucket rate limiter.
+
+        Callers only wait when a domain's budget is exhausted. A single
+        instance can be shared by threads (`acquire`) and asyncio tasks
+        (`acquire_async`) because the bucket bookkeeping happens under a
+        lock and the waiting happens outside of it.
+
+        Args:
+            rate: Default sustained requests per second for each domain
+            burst: Default number of requests allowed back to back
+            overrides: Optional {domain: (rate, burst)} for specific domains
+        """
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('DomainRateLimiter')
+
+    def _get_domain(self, url_or_domain):
+        """Accept either a full URL or a bare domain"""
+        if "://" in url_or_domain:
+            return urlparse(url_or_domain).netloc
+        return url_or_domain
+
+    def reserve(self, url_or_domain) -> float:
+        """Reserve a request slot and return the number of seconds to wait for it"""
+        domain = self._get_domain(url_or_domain)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                rate, burst = self.overrides.get(domain, (self.rate, self.burst))
+                bucket = self._buckets[domain] = TokenBucket(rate, burst)
+            return bucket.reserve()
+
+    def acquire(self, url_or_domain) -> float:
+        """Block the calling thread until a request to the domain is allowed"""
+        wait = self.reserve(url_or_domain)
+        if wait > 0:
+            self.logger.info(f"Sleeping for {wait:.2f}s to respect rate limits")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url_or_domain) -> float:
+        """Suspend the calling task until a request to the domain is allowed"""
+        wait = self.reserve(url_or_domain)
+        if wait > 0:
+            self.logger.info(f"Sleeping for {wait:.2f}s to respect rate limits")
+            await asyncio.sleep(wait)
+        return wait
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> DomainRateLimiter:
+    """
+    Return the process-wide limiter shared by every fetcher.
+    Rate and burst can be tuned with RATE_LIMIT_PER_SECOND and RATE_LIMIT_BURST.
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = DomainRateLimiter(
+                rate=float(os.environ.get("RATE_LIMIT_PER_SECOND", 1 / 3)),
+                burst=int(os.environ.get("RATE_LIMIT_BURST", 3)),
+            )
+        return _shared_limiter
@@ -0,0 +1,220 @@
+"""
+Reclassify the companies already stored in MongoDB, e.g. after
+files/industry_mapper.json changed, without re-scraping them.
+
+    python reclassify.py [--batch-size 5000] [--dry-run] [--legacy-by-description]
+
+Companies stored before `tags` was kept on the document cannot be scored
+on the same input as when they were scraped; they are skipped and counted
+unless --legacy-by-description scores them on their description.
+"""
+import os
+import time
+import argparse
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+from pymongo import UpdateOne
+from dotenv import load_dotenv
+
+from classifier import IndustryClassifier
+from database import MongoDataHandler
+
+load_dotenv()
+
+
+class VectorizedScorer:
+    def __init__(self, classifier: IndustryClassifier):
+        """
+        Scores batches of texts against every industry at once.
+
+        Each batch becomes a document x keyword incidence matrix (filled from
+        the classifier's keyword automaton) that is multiplied by a fixed
+        keyword x industry weight matrix. The winning industry of each row
+        matches `IndustryClassifier.classify_company`.
+
+        Args:
+            classifier: Classifier providing the industries and keyword automaton
+        """
+        self.classifier = classifier
+        self.matcher = classifier.matcher
+        self.industries = self.matcher.groups
+
+        # how many times each keyword is listed under each industry
+        self.weights = np.zeros((len(self.matcher.keywords), len(self.industries)), dtype=np.int32)
+        for keyword_id, group_weights in enumerate(self.matcher.weights):
+            for group_index, weight in group_weights:
+                self.weights[keyword_id, group_index] = weight
+
+    def score(self, texts) -> list:
+        """Industry name for each text, "Unknown" when no keyword matches"""
+        unique_texts = list(dict.fromkeys(texts))
+        rows, cols = [], []
+        for row, text in enumerate(unique_texts):
+            keyword_ids = self.matcher.find(text)
+            rows.extend([row] * len(keyword_ids))
+            cols.extend(keyword_ids)
+
+        incidence = np.zeros((len(unique_texts), len(self.matcher.keywords)), dtype=np.int32)
+        incidence[rows, cols] = 1
+        scores = incidence @ self.weights
+
+        # argmax keeps the first industry on ties, like max() over the scores dict
+        best = scores.argmax(axis=1)
+        matched = scores.max(axis=1) > 0
+        by_text = {
+            text: self.industries[best[row]] if matched[row] else "Unknown"
+            for row, text in enumerate(unique_texts)
+        }
+        return [by_text[text] for text in texts]
+
+
+class BulkReclassifier:
+    def __init__(self, company_handler, industry_handler, classifier=None, batch_size=5000, dry_run=False, legacy_by_description=False):
+        """
+        Streams the company collection in batches and rewrites changed `industry_id`s.
+
+        Args:
+            company_handler: MongoDataHandler on the company collection
+            industry_handler: MongoDataHandler on the industry collection
+            classifier: Classifier to score with, a fresh one reading industry_mapper.json by default
+            batch_size: Number of companies scored and written per batch
+            dry_run: Score and report without writing anything, new industries included
+            legacy_by_description: Score companies without a stored `tags` field on their
+                description instead of skipping them
+        """
+        self.company_handler = company_handler
+        self.industry_handler = industry_handler
+        self.classifier = classifier or IndustryClassifier()
+        self.scorer = VectorizedScorer(self.classifier)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.legacy_by_description = legacy_by_description
+        # industries the mapper knows but the collection does not, only reported in dry runs
+        self.unknown_industries = set()
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('BulkReclassifier')
+
+        self.industry_names = {
+            str(doc["_id"]): doc["name"]
+            for doc in self.industry_handler.collection.find({}, {"name": 1})
+        }
+        self.industry_ids = {name: industry_id for industry_id, name in self.industry_names.items()}
+
+    def _industry_id(self, name):
+        if name not in self.industry_ids:
+            if self.dry_run:
+                document = self.industry_handler.collection.find_one({"name": name}, {"_id": 1})
+                if document is None:
+                    self.unknown_industries.add(name)
+                    return None
+                industry_id = str(document["_id"])
+            else:
+                industry_id = self.industry_handler.check_and_create_document(name)
+            self.industry_ids[name] = industry_id
+            self.industry_names[industry_id] = name
+        return self.industry_ids[name]
+
+    def _text(self, company):
+        """Same input BLFlowHandler scores: the tags when present, else the description"""
+        tags = company.get("tags")
+        if tags:
+            return self.classifier.matcher.normalize(self.classifier._text_to_analyze(tags, "tags"))
+        return self.classifier.matcher.normalize(self.classifier._text_to_analyze(company.get("description") or "", "desc"))
+
+    def _process_batch(self, companies, moves):
+        industries = self.scorer.score([self._text(company) for company in companies])
+        updates = []
+        changed = 0
+        now = datetime.now(timezone.utc)
+        for company, industry in zip(companies, industries):
+            old_id = company.get("industry_id")
+            new_id = self._industry_id(industry)
+            if new_id is None:
+                # dry run: the industry would be created, so the company moves
+                moves[(self.industry_names.get(old_id, str(old_id)), industry)] += 1
+                changed += 1
+                continue
+            if old_id == new_id:
+                continue
+            moves[(self.industry_names.get(old_id, str(old_id)), industry)] += 1
+            updates.append(UpdateOne(
+                {"_id": company["_id"]},
+                {"$set": {"industry_id": new_id, "updated_at": now}}
+            ))
+
+        if updates and not self.dry_run:
+            self.company_handler.collection.bulk_write(updates, ordered=False)
+        return changed + len(updates)
+
+    def run(self) -> dict:
+        start = time.time()
+        moves = Counter()
+        scanned, changed, skipped = 0, 0, 0
+        batch = []
+        cursor = self.company_handler.collection.find(
+            {},
+            {"description": 1, "tags": 1, "industry_id": 1},
+            batch_size=self.batch_size
+        )
+        for company in cursor:
+            if "tags" not in company and not self.legacy_by_description:
+                # stored before tags were kept, its original input cannot be rebuilt
+                skipped += 1
+                continue
+            batch.append(company)
+            if len(batch) >= self.batch_size:
+                changed += self._process_batch(batch, moves)
+                scanned += len(batch)
+                batch = []
+                self.logger.info(f"Scanned {scanned} companies, {changed} changed")
+        if batch:
+            changed += self._process_batch(batch, moves)
+            scanned += len(batch)
+
+        report = {
+            "scanned": scanned,
+            "changed": changed,
+            "skipped_without_tags": skipped,
+            "unknown_industries": sorted(self.unknown_industries),
+            "seconds": round(time.time() - start, 2),
+            "moves": moves.most_common(),
+        }
+        self.logger.info(f"Reclassification done{' (dry run)' if self.dry_run else ''}: "
+                         f"{scanned} scanned, {changed} changed in {report['seconds']}s")
+        if skipped:
+            self.logger.warning(f"{skipped} companies have no stored tags and were skipped "
+                                f"(--legacy-by-description scores them on their description)")
+        if self.unknown_industries:
+            self.logger.info(f"Industries that would be created: {report['unknown_industries']}")
+        for (old, new), count in report["moves"]:
+            self.logger.info(f"  {old} -> {new}: {count}")
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reclassify stored companies with the current industry mapper")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing them")
+    parser.add_argument("--legacy-by-description", action="store_true",
+                        help="score companies stored without tags on their description instead of skipping them")
+    args = parser.parse_args()
+
+    with MongoDataHandler(
+        connection_string= os.environ["CONN_STRING"],
+        database_name= os.environ["DB_NAME"],
+        collection_name= os.environ["COMPANY_COLLECTION"]
+    ) as company_handler, MongoDataHandler(
+        connection_string= os.environ["CONN_STRING"],
+        database_name= os.environ["DB_NAME"],
+        collection_name= os.environ["INDUSTRY_COLLECTION"]
+    ) as industry_handler:
+        BulkReclassifier(company_handler, industry_handler, batch_size=args.batch_size, dry_run=args.dry_run,
+                         legacy_by_description=args.legacy_by_description).run()
+
+if __name__ == "__main__":
+    main()
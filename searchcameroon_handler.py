@@ -11,6 +11,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 from main import BLFlowHandler
+from http_client import get_http_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +22,7 @@ chrome_options = Options()
 chrome_options.add_argument("--headless")
 chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--no-sandbox")
+chrome_options.add_argument(f"user-agent={get_http_client().next_user_agent()}")
 
 # Path to your chromedriver executable
 driver_path = 'C:/Users/User/Desktop/Ongoing Project/Instanvi/repo/ABM-scraper/chromedriver/chromedriver.exe'
@@ -48,7 +50,7 @@ def get_company_links(page_source):
     return links
 
 # Function to extract company details from a detail page
-def get_company_details(driver, company_list, files_dir, scrapped_companies, page_number):
+def get_company_details(driver, checkpoint, page_number):
     # Wait until the key element is loaded (adjust the selector as needed)
     try:
         WebDriverWait(driver, 10).until(
@@ -68,7 +70,7 @@ def get_company_details(driver, company_list, files_dir, scrapped_companies, pag
     except Exception:
         name = ""
 
-    if str(name).lower() not in company_list:
+    if not checkpoint.is_done("searchcameroon", "company", str(name).lower()):
         try:
             details = driver.find_element(By.CLASS_NAME, "post-detail-content")
             details_soup = BeautifulSoup(details.get_attribute('outerHTML'), 'lxml')
@@ -120,13 +122,7 @@ def get_company_details(driver, company_list, files_dir, scrapped_companies, pag
             "size": "",
             "tags": ""
         }
-        name = str(name).lower()
-        scrapped_companies[name] = f"from page {page_number}"
-        file_path = os.path.join(files_dir, "scrapped_companies.json")
-        with open(file_path, 'w') as f:
-            json.dump(scrapped_companies, f, indent=4)
-
-        logger.info(f"Scraped company: {name}")
+        logger.info(f"Scraped company: {str(name).lower()}")
         return True, company_data
     else:
         logger.info(f"Already Scraped: {name}")
@@ -190,10 +186,6 @@ def main():
     files_dir = os.path.join(current_dir, "files")
     file_path = os.path.join(files_dir, "scrapped_companies.json")
 
-    if os.path.exists(file_path):
-        with open(file_path) as f:
-            companies = json.load(f)
-
     states_file_path = os.path.join(files_dir, "city_state.json")
     with open(states_file_path) as f:
         states = json.load(f)
@@ -201,6 +193,12 @@ def main():
     base_url = os.environ["BL_BASE_URL"]
     handler = BLFlowHandler(base_url=base_url)
 
+    # progress lives in the checkpoint journal, the legacy file is imported once
+    checkpoint = handler.checkpoint
+    if os.path.exists(file_path):
+        with open(file_path) as f:
+            checkpoint.seed("searchcameroon", "company", json.load(f).keys())
+
     for idx, start_url in enumerate(start_urls):
         # start_url = "https://searchcameroon.com/location/yaounde-g73-2/?v=820eb5b696ea"
         driver.get(start_url)
@@ -218,8 +216,6 @@ def main():
                 logger.error("Timeout waiting for company links to load.")
                 break
 
-            company_names = list(companies.keys())
-
             # Get company links from the current page
             company_links = get_company_links(driver.page_source)
 
@@ -233,13 +229,14 @@ def main():
                     # Optionally wait a bit for the page to load
                     time.sleep(2)
                     
-                    status, company_data = get_company_details(driver, company_names, files_dir, companies, page_number)
+                    status, company_data = get_company_details(driver, checkpoint, page_number)
                     if status and company_data:
                         # all_companies.append(company_data)
                         # print(f"{company_data}\n")
                         
                         updated_company_data = handler._organise_company_data(company_data, city, states)
                         status = handler.company_inserter.add_document(updated_company_data)
+                        checkpoint.mark("searchcameroon", "company", str(company_data["name"]).lower(), page=page_number)
                         logger.info("Send company data to buffer")
                     # break
                 except Exception as e:
@@ -279,6 +276,7 @@ def main():
                 continue
 
     driver.quit()
+    checkpoint.close()
 
     # Output the scraped data
     for company in all_companies:
@@ -0,0 +1,320 @@
+import time
+import logging
+
+from selenium.common.exceptions import WebDriverException
+
+
+# (limit, usage, stats, inactive page cache key) of cgroup v2 and v1
+CGROUP_MEMORY_FILES = [
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current", "/sys/fs/cgroup/memory.stat", "inactive_file"),
+    ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+     "/sys/fs/cgroup/memory/memory.stat", "total_inactive_file"),
+]
+
+
+def _read_bytes(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+        return None if value == "max" else int(value)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_stat(path, key):
+    try:
+        with open(path) as f:
+            for line in f:
+                name, _, value = line.partition(" ")
+                if name == key:
+                    return int(value)
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def cgroup_memory_mb():
+    """Memory left under the container's cgroup limit in MB, None when there is no limit"""
+    for limit_path, usage_path, stat_path, inactive_key in CGROUP_MEMORY_FILES:
+        limit, usage = _read_bytes(limit_path), _read_bytes(usage_path)
+        # v1 reports "no limit" as a huge number
+        if limit is None or usage is None or limit >= 1 << 60:
+            continue
+        # inactive page cache counts as usage but is reclaimed before the limit is hit
+        usage -= _read_stat(stat_path, inactive_key) or 0
+        return (limit - usage) // (1024 * 1024)
+    return None
+
+
+def meminfo_available_mb():
+    """MemAvailable from /proc/meminfo in MB, None where it cannot be read"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def available_memory_mb():
+    """
+    Memory this process can still use in MB: what is left under the cgroup limit in a
+    container (meminfo shows the host there), MemAvailable otherwise.
+    """
+    cgroup = cgroup_memory_mb()
+    meminfo = meminfo_available_mb()
+    if cgroup is None:
+        return meminfo
+    if meminfo is None:
+        return cgroup
+    return min(cgroup, meminfo)
+
+
+class PageNotReady(Exception):
+    """Raised by `on_ready` when the tab's page is not complete yet, the tab is polled again until its deadline"""
+
+
+class TabPool:
+    # returned by `next_job` once no more jobs will come
+    DONE = object()
+
+    def __init__(self,
+                driver_factory,
+                max_tabs: int = 4,
+                mb_per_tab: int = 150,
+                reserve_mb: int = 300,
+                max_pages_per_driver: int = 200,
+                poll_interval: float = 0.2,
+                resize_interval: float = 10,
+                on_reset=None):
+        """
+        Several tabs of one Chrome loading pages in parallel.
+
+        WebDriver talks to one tab at a time, but a tab keeps loading while
+        another one has the focus. Each job is started in a free tab with a
+        non-blocking `window.location` navigation, then busy tabs are polled
+        round-robin with their own readiness check and deadline, and a tab
+        is handed to `on_ready` as soon as its page is usable. This gives K
+        concurrent page loads for the memory of one browser process.
+
+        The number of tabs follows the available memory (the cgroup limit
+        in a container, MemAvailable otherwise): it grows while more than
+        `reserve_mb` plus `mb_per_tab` is free and shrinks (closing idle
+        tabs) when memory runs low, between 1 and `max_tabs`.
+
+        Args:
+            driver_factory: Callable returning a new webdriver, e.g. `setup_driver`
+            max_tabs: Upper bound for the number of tabs
+            mb_per_tab: Memory budget of one extra tab
+            reserve_mb: Memory left free for the rest of the process
+            max_pages_per_driver: Pages loaded before the browser is restarted
+            poll_interval: Pause between two polling rounds where no tab became ready
+            resize_interval: Seconds between two memory checks
+            on_reset: Optional callable(driver) run in every new tab, for per-tab setup
+        """
+        self.driver_factory = driver_factory
+        self.max_tabs = max_tabs
+        self.mb_per_tab = mb_per_tab
+        self.reserve_mb = reserve_mb
+        self.max_pages_per_driver = max_pages_per_driver
+        self.poll_interval = poll_interval
+        self.resize_interval = resize_interval
+        self.on_reset = on_reset
+
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('TabPool')
+
+        self.stats = {"pages": 0, "timeouts": 0, "errors": 0, "restarts": 0, "peak_tabs": 0}
+        self.driver = None
+        self.tabs = []
+        self._pages = 0
+        self._next_resize = 0.0
+        self._start()
+
+    @property
+    def size(self) -> int:
+        return len(self.tabs)
+
+    def _start(self) -> None:
+        self.driver = self.driver_factory()
+        self.tabs = []
+        self._pages = 0
+        # the first tab comes with the browser, it still needs the per-tab setup
+        self._add_tab(self.driver.current_window_handle)
+        self._resize(force=True)
+
+    def _add_tab(self, handle=None) -> None:
+        if handle is None:
+            self.driver.switch_to.new_window("tab")
+            handle = self.driver.current_window_handle
+        if self.on_reset is not None:
+            self.on_reset(self.driver)
+        self.tabs.append({"handle": handle, "job": None, "start_at": 0.0, "loading": False, "deadline": 0.0})
+        self.stats["peak_tabs"] = max(self.stats["peak_tabs"], len(self.tabs))
+
+    def _close_tab(self, tab) -> None:
+        self.driver.switch_to.window(tab["handle"])
+        self.driver.close()
+        self.tabs.remove(tab)
+
+    def target_tabs(self) -> int:
+        """Tab count the available memory allows right now"""
+        available = available_memory_mb()
+        if available is None:
+            return self.max_tabs
+        # open tabs are already accounted for in MemAvailable
+        extra = int((available - self.reserve_mb) // self.mb_per_tab)
+        return max(1, min(self.max_tabs, len(self.tabs) + extra))
+
+    def _resize(self, force=False) -> None:
+        if not force and time.time() < self._next_resize:
+            return
+        self._next_resize = time.time() + self.resize_interval
+        target = self.target_tabs()
+        if target == len(self.tabs):
+            return
+        while len(self.tabs) < target:
+            self._add_tab()
+        for tab in [tab for tab in self.tabs if tab["job"] is None][:len(self.tabs) - target]:
+            if len(self.tabs) > 1:
+                self._close_tab(tab)
+        self.logger.info(f"Using {len(self.tabs)} tabs ({available_memory_mb()} MB available)")
+
+    def _restart(self) -> None:
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            self.logger.warning(f"Error quitting driver: {str(e)}")
+        self.stats["restarts"] += 1
+        self._start()
+
+    def run(self, next_job, on_ready, ready_script="return document.readyState === 'complete';", timeout: float = 15, reserve=None) -> None:
+        """
+        Load jobs in the tabs until `next_job` returns TabPool.DONE and every tab is done.
+
+        Args:
+            next_job: Callable(wait) returning the next (url, context), None when there is
+                nothing yet (after waiting up to `wait` seconds) or TabPool.DONE
+            on_ready: Callable(driver, url, context) run with the driver switched to the
+                loaded tab; it must not block, and raises PageNotReady to be called again
+                on a later pass. Its other exceptions are logged and do not stop the pool
+            ready_script: JavaScript returning true once a page can be read
+            timeout: Seconds a page gets to become ready before it is dropped
+            reserve: Optional callable(url) reserving a request slot and returning the seconds
+                until it is usable, e.g. `DomainRateLimiter.reserve`. The tab holds its job
+                until then while the other tabs keep being polled.
+        """
+        done = False
+        retry = []
+        while True:
+            busy = [tab for tab in self.tabs if tab["job"] is not None]
+            if done and not retry and not busy:
+                return
+
+            # a browser past its page budget takes no new jobs and restarts once drained
+            if self._pages >= self.max_pages_per_driver:
+                if not busy:
+                    self._restart()
+                    continue
+            elif not done or retry:
+                self._resize()
+                for tab in self.tabs:
+                    if tab["job"] is not None:
+                        continue
+                    if retry:
+                        job = retry.pop(0)
+                    elif done:
+                        break
+                    else:
+                        # only block for work when no page is loading meanwhile
+                        job = next_job(0 if busy else self.poll_interval)
+                        if job is None:
+                            break
+                        if job is TabPool.DONE:
+                            done = True
+                            break
+                    tab["job"] = job
+                    tab["start_at"] = time.time() + (reserve(job[0]) if reserve else 0)
+                    tab["loading"] = False
+                    busy.append(tab)
+
+            if not self._navigate_due(timeout, retry) or not busy:
+                continue
+            if not self._poll(on_ready, ready_script, retry):
+                time.sleep(self._idle_sleep())
+
+    def _idle_sleep(self) -> float:
+        """Poll interval, shortened when a held job may start sooner"""
+        starts = [tab["start_at"] for tab in self.tabs if tab["job"] is not None and not tab["loading"]]
+        if not starts:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, min(starts) - time.time()))
+
+    def _navigate_due(self, timeout, retry) -> bool:
+        """Start the held jobs whose request slot has come, False if the browser had to restart"""
+        now = time.time()
+        for tab in self.tabs:
+            if tab["job"] is None or tab["loading"] or tab["start_at"] > now:
+                continue
+            try:
+                self.driver.switch_to.window(tab["handle"])
+                # the flag dies with the old page, so it cannot pass for the new one
+                self.driver.execute_script("window.__tabPoolStale = true; window.location.href = arguments[0];", tab["job"][0])
+            except WebDriverException as e:
+                self._recover(e, retry)
+                return False
+            tab["loading"] = True
+            tab["deadline"] = time.time() + timeout
+            self._pages += 1
+        return True
+
+    def _recover(self, error, retry) -> None:
+        """Restart a failed browser, its unfinished jobs go first once it is back"""
+        self.logger.error(f"Browser failed, restarting it: {str(error)}")
+        retry[:0] = [tab["job"] for tab in self.tabs if tab["job"] is not None]
+        self._restart()
+
+    def _poll(self, on_ready, ready_script, retry) -> bool:
+        """One round-robin pass over the loading tabs, True if any page was handed out"""
+        handed = False
+        for tab in [tab for tab in self.tabs if tab["job"] is not None and tab["loading"]]:
+            url, context = tab["job"]
+            try:
+                self.driver.switch_to.window(tab["handle"])
+                ready = self.driver.execute_script("if (window.__tabPoolStale) return false;\n" + ready_script)
+            except WebDriverException as e:
+                self._recover(e, retry)
+                return True
+
+            if ready:
+                try:
+                    on_ready(self.driver, url, context)
+                    self.stats["pages"] += 1
+                except PageNotReady:
+                    if time.time() < tab["deadline"]:
+                        continue
+                    self.stats["timeouts"] += 1
+                    self.logger.warning(f"Timed out reading {url}")
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    self.logger.error(f"Error reading {url}: {str(e)}")
+            elif time.time() >= tab["deadline"]:
+                self.stats["timeouts"] += 1
+                self.logger.warning(f"Timed out loading {url}")
+            else:
+                continue
+            tab["job"] = None
+            tab["loading"] = False
+            handed = True
+        return handed
+
+    def close(self) -> None:
+        """Quit the browser"""
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            self.logger.warning(f"Error quitting driver: {str(e)}")
+        self.logger.info(f"Tab pool closed, stats: {self.stats}")
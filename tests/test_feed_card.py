@@ -0,0 +1,50 @@
+import os
+import unittest
+from unittest import mock
+
+from google_handler import missing_fields, parse_feed_card, required_fields
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_card(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        card_html = f.read()
+    # the place URL is read from the card, like the feed scroll does
+    url = card_html.split('href="', 1)[1].split('"', 1)[0].replace("&amp;", "&")
+    return card_html, url
+
+
+class FeedCardTest(unittest.TestCase):
+    def test_fields(self):
+        card_html, url = read_card("maps_feed_card.html")
+        company_info = parse_feed_card(card_html, url, "Douala")
+        self.assertEqual(company_info["name"], "Boulangerie Exemple")
+        self.assertEqual(company_info["description"], "Bakery")
+        self.assertEqual(company_info["address"], "Rue Exemple 12")
+        self.assertEqual(company_info["contact_numbers"], ["699 00 00 01"])
+        self.assertEqual(company_info["website"], "https://boulangerie.example.cm/")
+        self.assertEqual((company_info["latitude"], company_info["longitude"]), ("4.0511", "9.7679"))
+
+    def test_rating_is_not_a_phone(self):
+        card_html, url = read_card("maps_feed_card_no_phone.html")
+        company_info = parse_feed_card(card_html, url, "Douala")
+        self.assertEqual(company_info["name"], "Garage Exemple")
+        self.assertEqual(company_info["description"], "Auto repair shop")
+        self.assertEqual(company_info["address"], "Boulevard Exemple")
+        self.assertEqual(company_info["contact_numbers"], [None])
+        self.assertIsNone(company_info["website"])
+
+    def test_card_without_website_needs_the_detail_page(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("GOOGLE_REQUIRED_FIELDS", None)
+            fields = required_fields()
+        self.assertEqual(fields, ["name", "contact_numbers", "website"])
+        card_html, url = read_card("maps_feed_card.html")
+        self.assertEqual(missing_fields(parse_feed_card(card_html, url, "Douala"), fields), [])
+        card_html, url = read_card("maps_feed_card_no_phone.html")
+        self.assertEqual(missing_fields(parse_feed_card(card_html, url, "Douala"), fields), ["contact_numbers", "website"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import unittest
+
+from maps_payload import decode_place_payload, decode_search_payload, feature_id, strip_xssi
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class PlacePayloadTest(unittest.TestCase):
+    def setUp(self):
+        self.company_info = decode_place_payload(read_fixture("maps_place_payload.txt"), "Douala")
+
+    def test_fields(self):
+        self.assertEqual(self.company_info["name"], "Boulangerie Exemple")
+        self.assertEqual(self.company_info["address"], "Rue Exemple 12")
+        self.assertEqual(self.company_info["contact_numbers"], ["699 00 00 01"])
+        self.assertEqual(self.company_info["website"], "https://boulangerie.example.cm/")
+        self.assertEqual(self.company_info["description"], "Bakery")
+        self.assertEqual((self.company_info["latitude"], self.company_info["longitude"]), ("4.0511", "9.7679"))
+
+    def test_payload_without_place(self):
+        self.assertIsNone(decode_place_payload(")]}'\n[null, null]"))
+
+
+class SearchPayloadTest(unittest.TestCase):
+    def setUp(self):
+        self.places = decode_search_payload(read_fixture("maps_search_payload.txt"), "Douala")
+
+    def test_keyed_by_feature_id(self):
+        self.assertEqual(list(self.places), [
+            "0x1061128be1b6f6a7:0x2b2f1c0c5a1e3d4f",
+            "0x10611297a3f0b2c1:0x8d5c3b2a1f0e9d8c",
+            "0x1061126d5e4c3b2a:0x1a2b3c4d5e6f7081",
+        ])
+
+    def test_address_fallback_drops_the_name(self):
+        garage = self.places["0x10611297a3f0b2c1:0x8d5c3b2a1f0e9d8c"]
+        self.assertEqual(garage["name"], "Garage Modèle")
+        self.assertEqual(garage["address"], "Avenue Modèle")
+
+    def test_international_phone_and_redirected_website(self):
+        garage = self.places["0x10611297a3f0b2c1:0x8d5c3b2a1f0e9d8c"]
+        self.assertEqual(garage["contact_numbers"], ["+237 677 00 00 02"])
+        self.assertEqual(garage["website"], "https://garage.example.cm/")
+
+    def test_missing_fields_are_none(self):
+        pharmacy = self.places["0x1061126d5e4c3b2a:0x1a2b3c4d5e6f7081"]
+        self.assertEqual(pharmacy["name"], "Pharmacie Témoin")
+        self.assertIsNone(pharmacy["address"])
+        self.assertEqual(pharmacy["contact_numbers"], [None])
+        self.assertIsNone(pharmacy["website"])
+
+
+class HelpersTest(unittest.TestCase):
+    def test_feature_id_from_place_url(self):
+        url = ("https://www.google.com/maps/place/Boulangerie+Exemple/data=!4m7!3m6"
+               "!1s0x1061128be1b6f6a7:0x2b2f1c0c5a1e3d4f!8m2!3d4.0511!4d9.7679")
+        self.assertEqual(feature_id(url), "0x1061128be1b6f6a7:0x2b2f1c0c5a1e3d4f")
+        self.assertIsNone(feature_id("https://www.google.com/maps/search/companies"))
+
+    def test_strip_xssi(self):
+        self.assertEqual(strip_xssi(")]}'\n[1, 2]"), [1, 2])
+        self.assertEqual(strip_xssi('{"c":0,"d":")]}\'\\n[3]"}/*""*/'), [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
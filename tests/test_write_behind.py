@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from bson import json_util
+from pymongo.errors import BulkWriteError
+
+from write_behind import WriteBehindQueue
+
+
+class RefusingCollection:
+    """Collection whose `insert_many` refuses documents named "Refused", like a failed schema validation"""
+
+    def __init__(self):
+        self.documents = []
+
+    def insert_many(self, documents, ordered=True):
+        write_errors = []
+        for index, document in enumerate(documents):
+            if document["name"] == "Refused":
+                write_errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+            else:
+                self.documents.append(document)
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": len(documents) - len(write_errors)})
+
+
+def make_handler(collection):
+    client = SimpleNamespace(admin=SimpleNamespace(command=lambda name: {"ok": 1}))
+    return SimpleNamespace(collection_name="companies", collection=collection, client=client, write_behind=None)
+
+
+class RefusedDocumentsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.collection = RefusingCollection()
+        self.queue = WriteBehindQueue(
+            [make_handler(self.collection)],
+            spill_path=os.path.join(self.directory, "spill.jsonl"),
+            max_wait_time=0.05
+        )
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.directory)
+
+    def test_refused_document_is_kept(self):
+        stored = []
+        self.queue.submit("companies", {"name": "Accepted"}, on_stored=lambda: stored.append("Accepted"))
+        self.queue.submit("companies", {"name": "Refused"}, on_stored=lambda: stored.append("Refused"))
+        self.queue.flush()
+
+        self.assertEqual([document["name"] for document in self.collection.documents], ["Accepted"])
+        self.assertEqual(stored, ["Accepted"])
+        with open(self.queue.rejected_path, encoding="utf-8") as f:
+            entries = [json_util.loads(line) for line in f]
+        self.assertEqual([(entry["collection"], entry["document"]["name"]) for entry in entries], [("companies", "Refused")])
+        self.assertEqual((self.queue.stats["written"], self.queue.stats["rejected"]), (1, 1))
+        self.assertFalse(os.path.exists(self.queue.spill_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,313 @@
+import os
+import time
+import queue
+import threading
+import logging
+from collections import defaultdict
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError, PyMongoError
+
+
+# appends from every writer of a spill file go through one lock
+_spill_file_lock = threading.Lock()
+
+
+def default_spill_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "files", "write_behind.jsonl")
+
+
+def append_spill(path, items) -> None:
+    """Append (collection_name, document) pairs to a spill file, in the format `WriteBehindQueue` replays"""
+    with _spill_file_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            for collection_name, document in items:
+                f.write(json_util.dumps({"collection": collection_name, "document": document}) + "\n")
+
+
+def run_callbacks(callbacks, logger) -> None:
+    """Run `on_stored` callbacks, one failing callback does not stop the others"""
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"on_stored callback failed: {str(e)}")
+
+
+class WriteBehindQueue:
+    def __init__(self,
+                handlers,
+                spill_path: str = None,
+                max_queue: int = 10000,
+                batch_size: int = 100,
+                max_wait_time: float = 1.0,
+                retry_interval: float = 30):
+        """
+        Write-behind layer between the scrapers and MongoDB.
+
+        Documents get their `_id` on submit and are handed to a writer thread
+        through a bounded queue, so Atlas latency never blocks scraping. When
+        the queue is full or the database is unreachable, documents are
+        appended to a local JSONL spill file instead, and the writer replays
+        that file once the database answers again. Replays are idempotent:
+        documents already written come back as duplicate keys and are skipped.
+        Documents the database refuses for other reasons (e.g. a validation
+        error) are kept in `.rejected` and counted as rejected, as are spilled
+        batches whose replay fails for anything but connectivity.
+
+        Args:
+            handlers: MongoDataHandlers whose `insert_document` should go through the queue
+            spill_path: Append-only JSONL file for documents that could not be written yet
+            max_queue: Capacity of the in-memory queue
+            batch_size: Maximum documents per `insert_many`
+            max_wait_time: Longest time (in seconds) the writer waits to fill a batch
+            retry_interval: Seconds between reconnection attempts while the database is down
+        """
+        # Configure logging
+        logging.basicConfig(level=logging.INFO)
+        self.logger = logging.getLogger('WriteBehindQueue')
+
+        self.handlers = {handler.collection_name: handler for handler in handlers}
+        self.spill_path = spill_path or default_spill_path()
+        self.replay_path = f"{self.spill_path}.replaying"
+        self.rejected_path = f"{self.spill_path}.rejected"
+        self.batch_size = batch_size
+        self.max_wait_time = max_wait_time
+        self.retry_interval = retry_interval
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.stats = {"queued": 0, "written": 0, "duplicates": 0, "spilled": 0, "replayed": 0, "failed": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+        # _id -> callable run once that document is written or spilled
+        self._on_stored = {}
+        self._spill_lock = threading.Lock()
+        self._db_down = False
+        self._next_retry = 0.0
+        self._stop = threading.Event()
+
+        for handler in handlers:
+            handler.write_behind = self
+
+        self._writer = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._writer.start()
+
+    def _count(self, key, value=1):
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def submit(self, collection_name: str, document: dict, on_stored=None) -> str:
+        """
+        Queue a document for `collection_name` and return its ID right away.
+
+        Args:
+            collection_name: Collection of one of the attached handlers
+            document: Dictionary containing the document data
+            on_stored: Optional callable run once the document is written or spilled to disk
+        """
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        item = (collection_name, document)
+        if on_stored is not None:
+            with self._stats_lock:
+                self._on_stored[document["_id"]] = on_stored
+
+        if self._db_down or self._stop.is_set():
+            self._spill([item])
+        else:
+            try:
+                self.queue.put_nowait(item)
+                self._count("queued")
+            except queue.Full:
+                self._spill([item])
+        return str(document["_id"])
+
+    def _spill(self, items) -> None:
+        with self._spill_lock:
+            append_spill(self.spill_path, items)
+        self._count("spilled", len(items))
+        # the spill file is replayed by the next write-behind run, so the documents are safe
+        self._settle([document for _, document in items], stored=True)
+
+    def _settle(self, documents, stored) -> None:
+        """Run (stored) or drop (refused) the `on_stored` callbacks of these documents"""
+        with self._stats_lock:
+            callbacks = [self._on_stored.pop(document.get("_id"), None) for document in documents]
+        if stored:
+            run_callbacks([callback for callback in callbacks if callback is not None], self.logger)
+
+    def _insert(self, collection_name, documents) -> None:
+        """Insert one batch, raising PyMongoError if the database cannot be reached"""
+        refused = set()
+        try:
+            self.handlers[collection_name].collection.insert_many(documents, ordered=False)
+            self._count("written", len(documents))
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            duplicates = sum(1 for error in write_errors if error.get("code") == 11000)
+            self._count("written", e.details.get("nInserted", 0))
+            self._count("duplicates", duplicates)
+            refused = {error.get("index") for error in write_errors if error.get("code") != 11000}
+            if refused:
+                # retrying would only be refused again, keep them aside for a look
+                self.logger.error(f"{len(refused)} documents rejected by {collection_name}, kept in {self.rejected_path}")
+                self._count("rejected", len(refused))
+                append_spill(self.rejected_path, [(collection_name, documents[index]) for index in sorted(refused)])
+        self._settle([document for index, document in enumerate(documents) if index not in refused], stored=True)
+        self._settle([documents[index] for index in refused], stored=False)
+
+    def _write(self, items) -> None:
+        by_collection = defaultdict(list)
+        for collection_name, document in items:
+            by_collection[collection_name].append(document)
+
+        for collection_name, documents in by_collection.items():
+            if self._db_down:
+                self._spill([(collection_name, document) for document in documents])
+                continue
+            try:
+                self._insert(collection_name, documents)
+            except PyMongoError as e:
+                self.logger.error(f"MongoDB unavailable, spilling to {self.spill_path}: {str(e)}")
+                self._db_down = True
+                self._next_retry = time.time() + self.retry_interval
+                self._spill([(collection_name, document) for document in documents])
+            except Exception as e:
+                # e.g. bson InvalidDocument: keep the batch on disk instead of losing the writer
+                self.logger.error(f"Batch for {collection_name} failed, spilling to {self.spill_path}: {str(e)}")
+                self._count("failed", len(documents))
+                # a batch the database refused may never be replayed, its progress stays unrecorded
+                self._settle(documents, stored=False)
+                self._spill_safely([(collection_name, document) for document in documents])
+
+    def _spill_safely(self, items) -> None:
+        """Spill one item at a time so an unserializable document only loses itself"""
+        for item in items:
+            try:
+                self._spill([item])
+            except Exception as e:
+                self.logger.error(f"Could not spill a document for {item[0]}: {str(e)}")
+
+    def _database_up(self) -> bool:
+        handler = next(iter(self.handlers.values()))
+        try:
+            handler.client.admin.command("ping")
+            return True
+        except PyMongoError:
+            return False
+
+    def _replay(self) -> None:
+        """Write back the spill file if there is one and the database answers"""
+        if not os.path.exists(self.spill_path) and not os.path.exists(self.replay_path):
+            return
+        if time.time() < self._next_retry:
+            return
+        if not self._database_up():
+            self._next_retry = time.time() + self.retry_interval
+            return
+
+        # new spills go to a fresh file while this one is replayed
+        with self._spill_lock:
+            if not os.path.exists(self.replay_path):
+                os.replace(self.spill_path, self.replay_path)
+
+        try:
+            batch = []
+            with open(self.replay_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json_util.loads(line)
+                    batch.append((entry["collection"], entry["document"]))
+                    if len(batch) >= self.batch_size:
+                        self._replay_batch(batch)
+                        batch = []
+            if batch:
+                self._replay_batch(batch)
+        except PyMongoError as e:
+            # the whole file is retried later, rows already written come back as duplicates
+            self.logger.error(f"Replay interrupted: {str(e)}")
+            self._next_retry = time.time() + self.retry_interval
+            return
+
+        os.remove(self.replay_path)
+        self._db_down = False
+        self.logger.info(f"Replayed spilled documents, stats: {self.stats}")
+
+    def _replay_batch(self, items) -> None:
+        by_collection = defaultdict(list)
+        for collection_name, document in items:
+            by_collection[collection_name].append(document)
+        for collection_name, documents in by_collection.items():
+            try:
+                self._insert(collection_name, documents)
+                self._count("replayed", len(documents))
+            except PyMongoError:
+                raise
+            except Exception as e:
+                # a batch the database will never accept must not block every later replay
+                self.logger.error(f"Spilled batch for {collection_name} rejected, kept in {self.rejected_path}: {str(e)}")
+                self._count("rejected", len(documents))
+                append_spill(self.rejected_path, [(collection_name, document) for document in documents])
+
+    def _next_batch(self):
+        batch = []
+        deadline = time.time() + self.max_wait_time
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self.logger.error(f"Write failed, spilling {len(batch)} documents: {str(e)}")
+                    self._count("failed", len(batch))
+                    self._settle([document for _, document in batch], stored=False)
+                    self._spill_safely(batch)
+                for _ in batch:
+                    self.queue.task_done()
+            try:
+                self._replay()
+            except Exception as e:
+                self.logger.error(f"Replay failed: {str(e)}")
+                self._next_retry = time.time() + self.retry_interval
+
+    def flush(self) -> None:
+        """Block until every document submitted so far is written or spilled"""
+        if self._writer.is_alive():
+            self.queue.join()
+
+    def close(self) -> dict:
+        """Drain the queue, try a last replay and detach from the handlers"""
+        self._stop.set()
+        self._writer.join()
+        # whatever a dead writer left behind goes to disk for the next run
+        leftover = []
+        while True:
+            try:
+                leftover.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            self.logger.warning(f"{len(leftover)} queued documents were not written, spilling them")
+            self._spill_safely(leftover)
+        self._next_retry = 0.0
+        try:
+            self._replay()
+        except Exception as e:
+            self.logger.error(f"Replay failed: {str(e)}")
+        for handler in self.handlers.values():
+            handler.write_behind = None
+        if os.path.exists(self.spill_path) or os.path.exists(self.replay_path):
+            self.logger.warning(f"Unwritten documents kept in {self.spill_path} for the next run")
+        self.logger.info(f"Write-behind stats: {self.stats}")
+        return dict(self.stats)